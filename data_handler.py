@@ -1,146 +1,392 @@
+import asyncio
 import json
 import os
 import re
-from urllib.parse import urlparse
+from io import BytesIO
 
-from bs4 import BeautifulSoup
+import lxml.html
 from lxml import etree
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 数据文件中非订阅源的保留键
+RESERVED_KEYS = frozenset({'rsshub_endpoints', 'settings'})
+
+# parse_channel_text_info 关心的节点，由 lxml 在 C 层完成筛选
+_CHANNEL_INFO_TAGS = ('{*}title', '{*}description', '{*}subtitle', '{*}item', '{*}entry')
+# 频道描述、频道级父节点 (RSS 为 channel，Atom 为 feed) 及条目节点的本地名
+_CHANNEL_DESC_TAGS = frozenset({'description', 'subtitle'})
+_CHANNEL_PARENT_TAGS = frozenset({'channel', 'feed'})
+_ITEM_TAGS = frozenset({'item', 'entry'})
+
+# strip_html 中整体丢弃的标签
+_STRIP_TAGS = frozenset({'script', 'style', 'iframe'})
+# strip_html 中结束时换行的标签
+_LINE_BREAK_TAGS = frozenset({'br', 'p'})
+
+# smart_truncate 使用的句子结束符
+_SENTENCE_DELIMITERS = frozenset('。！？.!?\n')
+_ASCII_SENTENCE_DELIMITERS = ('.', '!', '?', '\n')
+
+# 流式提取的媒体标签及每次送入解析器的HTML长度
+_MEDIA_TAGS = ('img', 'video', 'iframe', 'audio')
+_HTML_CHUNK_SIZE = 64 * 1024
+
+# 共享的HTML解析器，不收集 id 属性以减少建树开销
+_HTML_PARSER = lxml.html.HTMLParser(collect_ids=False)
+
+# 开头的 XML 声明，带编码声明的 str 无法交给 lxml 解析
+_XML_DECL_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# 快速路径：不含相关标签时跳过HTML解析
+_IMG_TAG_RE = re.compile(r'<img', re.IGNORECASE)
+_MEDIA_TAG_RE = re.compile(r'<(?:img|video|iframe|audio)', re.IGNORECASE)
+
+# 图片过滤规则：过滤掉tracking pixels和emoji等
+_IMG_FILTER_RE = re.compile(r'tracking|pixel|emoji|icon', re.IGNORECASE)
+_TRACKING_RE = re.compile(r'tracking|pixel', re.IGNORECASE)
+
+# 标记修改后延迟多少秒写入数据文件
+_SAVE_DELAY = 1.0
+
+
+def _json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
 
 class DataHandler:
     def __init__(self, config_path, default_config=None):
         self.config_path = config_path
         self.default_config = default_config or {'rsshub_endpoints': []}
+        # 最近一次读写的内容，用于跳过重复写入
+        self._saved_bytes = None
+        # 延迟写入的定时句柄，存在时说明有尚未写入的修改
+        self._save_handle = None
         self.data = self.load_data()
+        self._build_index()
 
-    def get_subs_channel_url(self, user_id) -> list:
-        """获取用户订阅的频道 url 列表"""
-        subs_url = []
+    def _build_index(self):
+        """构建 用户 -> 订阅url 的倒排索引、url 在数据文件中的顺序，以及 RSSHub 端点索引"""
+        self._url_order = {}
+        self._by_user = {}
         for url, info in self.data.items():
-            if url == 'rsshub_endpoints' or url == 'settings':
+            if url in RESERVED_KEYS:
                 continue
-            if user_id in info['subscribers']:
-                subs_url.append(url)
-        return subs_url
+            self._url_order[url] = len(self._url_order)
+            for user_id in info['subscribers']:
+                self._by_user.setdefault(user_id, set()).add(url)
+        self._build_endpoint_index()
+
+    def _build_endpoint_index(self):
+        """构建 RSSHub 端点 -> 索引 的映射，重复的端点取第一个索引"""
+        self._endpoint_index = {}
+        for idx, url in enumerate(self.data.get('rsshub_endpoints', ())):
+            self._endpoint_index.setdefault(url, idx)
+
+    def get_subs_channel_url(self, user_id) -> list:
+        """获取用户订阅的频道 url 列表，顺序与数据文件中的频道顺序一致"""
+        subs = self._by_user.get(user_id)
+        if not subs:
+            return []
+        return sorted(subs, key=self._url_order.__getitem__)
+
+    def add_subscriber(self, url, user_id, sub_info: dict, channel_info: dict = None):
+        """添加(或更新)订阅，url 不存在时需提供频道信息"""
+        if url not in self.data:
+            self.data[url] = {'subscribers': {}, 'info': channel_info}
+            self._url_order[url] = len(self._url_order)
+        self.data[url]['subscribers'][user_id] = sub_info
+        self._by_user.setdefault(user_id, set()).add(url)
+
+    def remove_subscriber(self, url, user_id):
+        """移除订阅"""
+        self.data[url]['subscribers'].pop(user_id, None)
+        subs = self._by_user.get(user_id)
+        if subs:
+            subs.discard(url)
+
+    def has_endpoint(self, url) -> bool:
+        """RSSHub 端点是否已存在"""
+        return url in self._endpoint_index
+
+    def get_endpoint_index(self, url) -> int:
+        """获取 RSSHub 端点的索引，不存在时返回 -1"""
+        return self._endpoint_index.get(url, -1)
+
+    def add_endpoint(self, url):
+        """添加 RSSHub 端点"""
+        endpoints = self.data['rsshub_endpoints']
+        self._endpoint_index.setdefault(url, len(endpoints))
+        endpoints.append(url)
+
+    def remove_endpoint(self, idx: int) -> str:
+        """按索引删除 RSSHub 端点，返回被删除的端点"""
+        url = self.data['rsshub_endpoints'].pop(idx)
+        # 删除后其后的端点索引整体前移，重新构建映射
+        self._build_endpoint_index()
+        return url
 
     def load_data(self):
         """从数据文件中加载数据"""
         if not os.path.exists(self.config_path):
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                f.write(json.dumps(self.default_config, indent=2, ensure_ascii=False))
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            with open(self.config_path, 'wb') as f:
+                f.write(_json_dumps(self.default_config))
+
+        # 无缓冲一次性读取整个文件，由 json 解析器直接处理 UTF-8 字节
+        with open(self.config_path, 'rb', buffering=0) as f:
+            raw = f.read()
+        self._saved_bytes = raw
+        return _json_loads(raw)
 
     def save_data(self):
-        """保存数据到数据文件"""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        """保存数据到数据文件，内容未变化时跳过写入"""
+        raw = _json_dumps(self.data)
+        if raw == self._saved_bytes:
+            return
+
+        # 先写临时文件再替换，避免写入中途崩溃导致数据文件损坏
+        tmp_path = self.config_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_path, self.config_path)
+
+        self._saved_bytes = raw
+
+    def mark_dirty(self):
+        """标记数据已修改，短时间内的多次修改合并为一次写入"""
+        if self._save_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 不在事件循环中时直接写入
+            self.save_data()
+            return
+        self._save_handle = loop.call_later(_SAVE_DELAY, self.flush)
+
+    def flush(self):
+        """立即写入尚未保存的修改"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        self.save_data()
 
     def parse_channel_text_info(self, text):
-        """解析RSS频道信息"""
-        root = etree.fromstring(text)
-
-        # 检测是否为Atom feed
-        is_atom = root.tag.endswith('feed') or 'atom' in root.tag.lower()
-
-        # 安全获取title
-        if is_atom:
-            # Atom格式 - 使用local-name()避免命名空间问题
-            title_elements = root.xpath("//*[local-name()='title']")
-        else:
-            # RSS格式
-            title_elements = root.xpath('//channel/title')
-            if not title_elements:
-                title_elements = root.xpath('//title')
-
-        title = title_elements[0].text if title_elements and title_elements[0].text else '未知频道'
-
-        # 安全获取description/subtitle
-        if is_atom:
-            # Atom格式使用subtitle
-            desc_elements = root.xpath("//*[local-name()='subtitle']")
-        else:
-            # RSS格式
-            desc_elements = root.xpath('//channel/description')
-            if not desc_elements:
-                desc_elements = root.xpath('//description')
-
-        description = desc_elements[0].text if desc_elements and desc_elements[0].text else '无描述'
+        """解析RSS频道信息
+
+        使用 iterparse 流式解析，取到频道级的标题和描述后立即停止，避免构建完整 DOM
+        """
+        if isinstance(text, str):
+            text = text.encode('utf-8')
+
+        title = description = None
+        # 是否出现过频道级节点，节点存在但内容为空时不退化
+        has_title = has_desc = False
+        # 频道级节点缺失时，退化为文档中第一个出现的节点
+        fallback_title = fallback_desc = None
+
+        for _, elem in etree.iterparse(BytesIO(text), events=('end',), tag=_CHANNEL_INFO_TAGS):
+            tag = etree.QName(elem).localname
+            if tag == 'title' or tag in _CHANNEL_DESC_TAGS:
+                parent = elem.getparent()
+                # RSS 为 channel/title，Atom 为 feed/title
+                is_channel_level = parent is not None and etree.QName(parent).localname in _CHANNEL_PARENT_TAGS
+                if tag == 'title':
+                    if is_channel_level and not has_title:
+                        has_title = True
+                        title = elem.text
+                    elif fallback_title is None:
+                        fallback_title = elem.text
+                else:
+                    if is_channel_level and not has_desc:
+                        has_desc = True
+                        description = elem.text
+                    elif fallback_desc is None:
+                        fallback_desc = elem.text
+                if has_title and has_desc:
+                    break
+            elif tag in _ITEM_TAGS:
+                # 释放已处理条目占用的内存
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+        title = (title if has_title else fallback_title) or '未知频道'
+        description = (description if has_desc else fallback_desc) or '无描述'
 
         return title, description
 
+    def _parse_html_tree(self, html):
+        """使用 lxml.html 解析HTML片段，空内容或无法解析时返回 None"""
+        if isinstance(html, str) and html.lstrip().startswith('<?xml'):
+            # lxml 拒绝解析带编码声明的 str (ValueError)，去掉声明后再解析
+            html = _XML_DECL_RE.sub('', html, count=1)
+        try:
+            return lxml.html.fromstring(html, parser=_HTML_PARSER)
+        except (etree.ParserError, ValueError):
+            return None
+
+    def _get_media_src(self, elem):
+        """获取媒体节点的地址，优先使用自身 src，其次是子节点 source 的 src"""
+        src = elem.get('src')
+        if src:
+            return src
+        source = elem.find('source')
+        return source.get('src') if source is not None else None
+
     def strip_html_pic(self, html) -> list[str]:
         """解析HTML内容，提取图片地址"""
-        if not html:
+        if not html or not _IMG_TAG_RE.search(html):
             return []
 
-        soup = BeautifulSoup(html, 'html.parser')
         ordered_content = []
 
         # 处理图片节点
-        for img in soup.find_all('img'):
+        for img in self._iter_html_elements(html, ('img',)):
             img_src = img.get('src') or img.get('data-src')  # 支持懒加载图片
-            if img_src:
-                # 过滤掉tracking pixels和emoji，保留gif
-                if not any(x in img_src.lower() for x in ['tracking', 'pixel', 'emoji', 'icon']) or 'github' in img_src:
-                    ordered_content.append(img_src)
+            if not img_src:
+                continue
+            # 过滤掉tracking pixels和emoji，保留gif；github 图片不做过滤
+            if 'github' not in img_src and _IMG_FILTER_RE.search(img_src):
+                continue
+            ordered_content.append(img_src)
 
         return ordered_content
 
     def extract_media_urls(self, html) -> dict:
         """提取HTML中的媒体URL(图片、视频等)"""
+        if not html or not _MEDIA_TAG_RE.search(html):
+            return self._empty_media()
+
+        media = self._empty_media()
+        for elem in self._iter_html_elements(html, _MEDIA_TAGS):
+            if elem.tag == 'img':
+                src = elem.get('src') or elem.get('data-src')
+                if src and not _TRACKING_RE.search(src):
+                    media['images'].append(src)
+            else:
+                src = self._get_media_src(elem)
+                if src:
+                    media['audios' if elem.tag == 'audio' else 'videos'].append(src)
+        return media
+
+    def _iter_html_elements(self, html, tags):
+        """流式解析HTML，按出现顺序产出指定标签的节点，节点处理完后立即释放"""
+        parser = etree.HTMLPullParser(events=('end',), tag=tags, collect_ids=False)
+        for start in range(0, len(html), _HTML_CHUNK_SIZE):
+            parser.feed(html[start : start + _HTML_CHUNK_SIZE])
+            yield from self._drain_html_events(parser)
+        parser.close()
+        yield from self._drain_html_events(parser)
+
+    def _drain_html_events(self, parser):
+        for _, elem in parser.read_events():
+            yield elem
+            elem.clear(keep_tail=True)
+            # 删除已处理完的兄弟节点；媒体节点下的 source 仍需保留
+            parent = elem.getparent()
+            if parent is not None and parent.tag not in _MEDIA_TAGS:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    def strip_html(self, html):
+        """去除HTML标签,保留基本格式"""
         if not html:
-            return {'images': [], 'videos': [], 'audios': []}
+            return ''
+        # 纯文本（无标签、无实体）无需解析
+        if '<' not in html and '&' not in html:
+            return self._collapse_whitespace(html)
+
+        tree = self._parse_html_tree(html)
+        if tree is None:
+            return ''
+        return self._extract_text(tree)
+
+    def parse_entry(self, html) -> tuple[str, dict]:
+        """只解析一次HTML，同时得到 strip_html 的文本和 extract_media_urls 的媒体URL"""
+        if not html:
+            return '', self._empty_media()
+        if '<' not in html and '&' not in html:
+            return self._collapse_whitespace(html), self._empty_media()
+
+        tree = self._parse_html_tree(html)
+        if tree is None:
+            return '', self._empty_media()
+        return self._extract_text(tree), self._extract_media(tree)
 
-        soup = BeautifulSoup(html, 'html.parser')
-        media = {'images': [], 'videos': [], 'audios': []}
+    def _empty_media(self) -> dict:
+        return {'images': [], 'videos': [], 'audios': []}
+
+    def _extract_media(self, tree) -> dict:
+        """从已解析的HTML树中提取媒体URL"""
+        media = self._empty_media()
 
         # 提取图片
-        for img in soup.find_all('img'):
+        for img in tree.iter('img'):
             src = img.get('src') or img.get('data-src')
-            if src and not any(x in src.lower() for x in ['tracking', 'pixel']):
+            if src and not _TRACKING_RE.search(src):
                 media['images'].append(src)
 
         # 提取视频
-        for video in soup.find_all(['video', 'iframe']):
-            src = video.get('src') or (video.find('source') and video.find('source').get('src'))
+        for video in tree.iter('video', 'iframe'):
+            src = self._get_media_src(video)
             if src:
                 media['videos'].append(src)
 
         # 提取音频
-        for audio in soup.find_all('audio'):
-            src = audio.get('src') or (audio.find('source') and audio.find('source').get('src'))
+        for audio in tree.iter('audio'):
+            src = self._get_media_src(audio)
             if src:
                 media['audios'].append(src)
 
         return media
 
-    def strip_html(self, html):
-        """去除HTML标签,保留基本格式"""
-        if not html:
-            return ''
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # 移除script和style标签
-        for tag in soup(['script', 'style', 'iframe']):
-            tag.decompose()
-
-        # 处理段落和换行
-        for br in soup.find_all('br'):
-            br.replace_with('\n')
-        for p in soup.find_all('p'):
-            p.append('\n')
-
-        # 获取文本
-        text = soup.get_text(separator=' ')
-
-        # 清理多余空白
-        text = re.sub(r' +', ' ', text)  # 多个空格变一个
-        text = re.sub(r'\n\s*\n', '\n\n', text)  # 多个换行变两个
-        text = text.strip()
+    def _extract_text(self, tree) -> str:
+        """从已解析的HTML树中提取文本（只读遍历，不修改树）"""
+        # 单次遍历：跳过script/style/iframe，br和段落末尾换行，文本之间以空格分隔
+        pieces = []
+        walker = etree.iterwalk(tree, events=('start', 'end', 'comment', 'pi'))
+        for event, elem in walker:
+            if event == 'start':
+                if elem.tag in _STRIP_TAGS:
+                    walker.skip_subtree()
+                elif elem.text:
+                    pieces.append(elem.text)
+                continue
 
-        return text
+            if event == 'end':
+                if elem.tag in _LINE_BREAK_TAGS:
+                    pieces.append('\n')
+            if elem.tail and elem is not tree:
+                pieces.append(elem.tail)
+
+        return self._collapse_whitespace(' '.join(pieces))
+
+    def _collapse_whitespace(self, text: str) -> str:
+        """清理多余空白：行内连续空白变一个空格，连续空行合并为一个"""
+        lines = []
+        pending_blank = False
+        for line in text.split('\n'):
+            line = ' '.join(line.split())
+            if not line:
+                pending_blank = True
+                continue
+            if pending_blank and lines:
+                lines.append('')
+            lines.append(line)
+            pending_blank = False
+        return '\n'.join(lines)
 
     def smart_truncate(self, text: str, max_length: int, preserve_words: bool = True) -> str:
         """智能截断文本,尽量在句子或词语边界截断"""
@@ -148,13 +394,19 @@ class DataHandler:
             return text
 
         if preserve_words:
-            # 尝试在句子边界截断
+            # 尝试在句子边界截断：从右向左单次扫描，找最后一个句子结束符
             truncated = text[:max_length]
-            # 查找最后一个句号、问号或感叹号
-            for delimiter in ['。', '！', '？', '.', '!', '?', '\n']:
-                last_pos = truncated.rfind(delimiter)
-                if last_pos > max_length * 0.7:  # 至少保留70%
+            # 至少保留70%，只需扫描尾部
+            min_pos = int(max_length * 0.7)
+            if truncated.isascii():
+                # ASCII 文本只会出现半角结束符，直接用 C 层的 rfind 扫描
+                last_pos = max(truncated.rfind(d, min_pos + 1) for d in _ASCII_SENTENCE_DELIMITERS)
+                if last_pos != -1:
                     return text[: last_pos + 1]
+            else:
+                for pos in range(len(truncated) - 1, min_pos, -1):
+                    if truncated[pos] in _SENTENCE_DELIMITERS:
+                        return text[: pos + 1]
 
             # 如果没有句子边界,尝试在空格处截断
             last_space = truncated.rfind(' ')
@@ -165,5 +417,14 @@ class DataHandler:
 
     def get_root_url(self, url):
         """获取URL的根域名"""
-        parsed_url = urlparse(url)
-        return f'{parsed_url.scheme}://{parsed_url.netloc}'
+        scheme_end = url.find('://')
+        if scheme_end == -1:
+            return url
+        netloc_start = scheme_end + 3
+        # netloc 在第一个 / ? # 处结束
+        netloc_end = len(url)
+        for sep in ('/', '?', '#'):
+            pos = url.find(sep, netloc_start, netloc_end)
+            if pos != -1:
+                netloc_end = pos
+        return url[:netloc_end]
@@ -1,10 +1,14 @@
 import asyncio
+import functools
 import logging
 import os
 import re
 import time
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 import aiohttp
@@ -20,10 +24,205 @@ from astrbot.api.event import AstrMessageEvent, MessageChain, MessageEventResult
 from astrbot.api.star import Context, Star, StarTools, register
 from lxml import etree
 
-from .data_handler import DataHandler
+from .data_handler import RESERVED_KEYS, DataHandler
 from .pic_handler import RssImageHandler
 from .rss import RSSItem
 
+# 请求订阅源时使用的请求头
+_FEED_REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+# 同一时刻触发的多个定时任务并发请求订阅源时的最大并发数
+_MAX_CONCURRENT_FETCHES = 16
+
+# 流式读取订阅源时每次读取的字节数
+_FEED_CHUNK_SIZE = 32 * 1024
+
+# 订阅源超过该大小时，超出部分在线程中解析
+_THREAD_PARSE_THRESHOLD = 128 * 1024
+
+# 每个订阅最多记录多少条已推送条目的标识哈希，用于去重
+_MAX_SENT_IDS = 50
+
+# 合并转发节点的发送者
+_NODE_UIN = 0
+_NODE_NAME = 'Astrbot'
+
+# 消息中的分隔线
+_SEPARATOR = '─' * 30
+
+# 合并推送时，最后一次更新后等待多少秒再发送
+_PUSH_MERGE_DELAY = 2
+
+# 判断链接是否为绝对地址
+_URL_SCHEMES = ('http://', 'https://')
+
+# 网址（http/https 开头）或 IPv4 地址
+_URL_OR_IP_RE = re.compile(
+    r'^(?:(?:http|https)://.+|((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?))$'
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _item_fields(ns: str, is_atom: bool) -> Dict[str, str]:
+    """item/entry 子节点标签 -> 字段名，按命名空间缓存（Atom 子节点与 entry 同命名空间，RSS 仅标题带命名空间）"""
+    if is_atom:
+        names = ('title', 'link', 'content', 'summary', 'category', 'id', 'updated', 'published', 'author')
+        return {ns + name: name for name in names}
+    names = ('link', 'description', 'author', 'category', 'enclosure', 'comments', 'guid', 'pubDate')
+    fields = {name: name for name in names}
+    fields[ns + 'title'] = 'title'
+    return fields
+
+
+# RSS 中任意命名空间下都识别的子节点（content:encoded / dc:creator）
+_RSS_ANY_NS_FIELDS = frozenset(('encoded', 'creator'))
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_cron_expr(cron_expr: str) -> Dict[str, str]:
+    """解析 Cron 表达式为 APScheduler 参数，订阅通常共用少数几个表达式，按表达式缓存
+
+    返回的字典为缓存共享，调用方只能读取（如 ** 解包），不能修改
+    """
+    fields = cron_expr.split(' ')
+    return {
+        'minute': fields[0],
+        'hour': fields[1],
+        'day': fields[2],
+        'month': fields[3],
+        'day_of_week': fields[4],
+    }
+
+
+# 常见日期格式（email.utils / fromisoformat 均无法解析时的兜底）
+_DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %z',  # RSS标准: Wed, 02 Oct 2002 13:00:00 GMT
+    '%a, %d %b %Y %H:%M:%S GMT',  # RSS GMT格式
+    '%Y-%m-%dT%H:%M:%S%z',  # ISO 8601: 2002-10-02T13:00:00+00:00
+    '%Y-%m-%dT%H:%M:%SZ',  # ISO 8601 UTC: 2002-10-02T13:00:00Z
+    '%Y-%m-%dT%H:%M:%S.%f%z',  # ISO 8601带毫秒
+    '%Y-%m-%dT%H:%M:%S.%fZ',  # ISO 8601 UTC带毫秒
+    '%Y-%m-%d %H:%M:%S',  # 简单格式
+    '%Y/%m/%d %H:%M:%S',  # 斜杠分隔
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_timestamp(date_str: str) -> Optional[int]:
+    """将日期字符串解析为时间戳，无法解析时返回 None
+
+    结果只取决于原始字符串，按字符串缓存，同一日期在多个条目/多次轮询中只解析一次
+    """
+    dt = _parse_datetime(date_str)
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _parse_datetime(date_str: str) -> Optional[datetime]:
+    """按格式分派到对应的 C 实现解析器，失败时再逐个尝试常见格式"""
+    if len(date_str) >= 10 and date_str[4] == '-':
+        # ISO 8601 (Atom): 2002-10-02T13:00:00Z
+        try:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    else:
+        # RFC 822 (RSS): Wed, 02 Oct 2002 13:00:00 GMT
+        try:
+            return parsedate_to_datetime(date_str)
+        except (TypeError, ValueError, IndexError):
+            pass
+
+    # 预处理
+    if 'GMT' in date_str:
+        date_str = date_str.replace('GMT', '+0000')
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _item_id_hash(item: RSSItem) -> int:
+    """条目标识 (guid 或链接) 的 32 位哈希，写入数据文件比完整标识小得多"""
+    return zlib.crc32((item.guid or item.link).encode('utf-8'))
+
+
+class _AddResult(NamedTuple):
+    """添加订阅的结果：成功时为频道信息，失败时为返回给用户的错误消息"""
+
+    info: Optional[Dict] = None
+    error: Optional[MessageEventResult] = None
+
+
+def _build_nodes(main_comps: List, video_comp=None) -> List:
+    """构造一条 RSS 条目的合并转发节点：文本和图片一个节点，视频单独一个节点"""
+    nodes = [Comp.Node(uin=_NODE_UIN, name=_NODE_NAME, content=main_comps)]
+    if video_comp:
+        nodes.append(Comp.Node(uin=_NODE_UIN, name=_NODE_NAME, content=[video_comp]))
+    return nodes
+
+
+class _FeedParser:
+    """订阅源增量解析器，只处理 RSS 的 item 和 Atom 的 entry，处理完立即释放"""
+
+    def __init__(self, plugin: 'RssPlugin', url: str, chan_title: str):
+        self.plugin = plugin
+        self.url = url
+        self.chan_title = chan_title
+        self.items: List[RSSItem] = []
+        self.failed = False
+        self.fed_bytes = 0
+        self._parser = etree.XMLPullParser(events=('end',), tag=('{*}item', '{*}entry'))
+
+    def feed_chunk(self, chunk: bytes):
+        """喂入一块数据并解析已经完整的条目"""
+        self.fed_bytes += len(chunk)
+        if self.failed:
+            return
+        try:
+            self._parser.feed(chunk)
+        except Exception as e:
+            self._fail(e)
+        self._read_items()
+
+    async def feed_chunk_async(self, chunk: bytes):
+        """同 feed_chunk，已读取的数据超过阈值后改为在线程中解析，避免大型订阅源长时间阻塞事件循环"""
+        if self.fed_bytes >= _THREAD_PARSE_THRESHOLD:
+            await asyncio.to_thread(self.feed_chunk, chunk)
+        else:
+            self.feed_chunk(chunk)
+
+    def close(self) -> List[RSSItem]:
+        """结束解析，返回所有条目，文档格式有误时与整体解析一致返回空列表"""
+        if not self.failed:
+            try:
+                self._parser.close()
+            except Exception as e:
+                self._fail(e)
+            self._read_items()
+        return [] if self.failed else self.items
+
+    def _fail(self, e: Exception):
+        self.failed = True
+        self.plugin.logger.error(f'rss: XML解析失败 {self.url}: {str(e)}')
+
+    def _read_items(self):
+        for _, item in self._parser.read_events():
+            try:
+                self.items.append(self.plugin._parse_feed_item(item, self.url, self.chan_title))
+            except Exception as e:
+                self.plugin.logger.error(f'rss: 解析Rss条目 {self.url} 失败: {str(e)}')
+            finally:
+                item.clear(keep_tail=True)
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+
 
 @register(
     'astrbot_plugin_rss',
@@ -50,6 +249,7 @@ class RssPlugin(Star):
         self.is_hide_url = config.get('is_hide_url')
         self.is_compose = config.get('compose')
         self.is_download_video = config.get('is_download_video', False)
+        self.is_merge_push = config.get('merge_push', False)
 
         # 图片配置
         self.is_read_pic = config.get('pic_config').get('is_read_pic')
@@ -57,15 +257,38 @@ class RssPlugin(Star):
         self.max_pic_item = config.get('pic_config').get('max_pic_item')
         self.cleanup_cron = config.get('pic_config').get('cleanup_cron')
         self.cleanup_retention = config.get('pic_config').get('cleanup_retention')
+        self.cache_max_size = config.get('pic_config').get('cache_max_size', 500)  # 单位: MB
         # 时区配置
         self.time_zone = config.get('time_zone', 'Asia/Shanghai')
+        try:
+            self.tz = ZoneInfo(self.time_zone)
+        except Exception as e:
+            # 时区无效时使用本地时间
+            self.logger.warning(f'[RSS] 无效的时区 {self.time_zone}: {e}')
+            self.tz = None
 
-        self.pic_handler = RssImageHandler(self.is_adjust_pic)
+        self.pic_handler = RssImageHandler(self.is_adjust_pic, self._get_session, self.cache_max_size * 1024 * 1024)
 
         # 缓存与锁
         self.cache_timeout = config.get('cache_timeout', 60)  # 缓存有效期
-        self.feed_cache: Dict[str, Dict] = {}  # 格式: {url: {'ts': timestamp, 'items': [RSSItem]}}
-        self.fetch_locks: Dict[str, asyncio.Lock] = {}  # 格式: {url: asyncio.Lock()}
+        self.cache_max_entries = config.get('cache_max_entries', 256)  # 最多缓存的订阅源数量
+        # LRU 缓存，格式: {url: {'ts': timestamp, 'items': (RSSItem, ...), 'etag': str, 'last_modified': str,
+        #                        'filtered': {(num, after_timestamp, after_link, exclude_ids): (RSSItem, ...)}}}
+        # 过滤结果随订阅源条目一起保存，订阅源刷新或被淘汰时一并释放
+        self.feed_cache: OrderedDict[str, Dict] = OrderedDict()
+        self.inflight_fetches: Dict[str, asyncio.Future] = {}  # 格式: {url: 进行中的请求}
+        self.fetch_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES)  # 同时请求订阅源的最大数量
+
+        # 已添加到调度器的订阅任务：{job_id: cron_expr}
+        self.applied_jobs: Dict[str, str] = {}
+
+        # 合并推送：{user: [Comp.Node]} 待发送节点及对应的延迟发送句柄
+        self.pending_pushes: Dict[str, List] = {}
+        self.push_flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self.background_tasks = set()
+
+        # 共享的 HTTP 会话，首次请求时创建
+        self.http_session: Optional[aiohttp.ClientSession] = None
 
         self.scheduler = AsyncIOScheduler()
         self.scheduler.start()
@@ -75,14 +298,7 @@ class RssPlugin(Star):
         self._fresh_asyncIOScheduler()
 
     def parse_cron_expr(self, cron_expr: str):
-        fields = cron_expr.split(' ')
-        return {
-            'minute': fields[0],
-            'hour': fields[1],
-            'day': fields[2],
-            'month': fields[3],
-            'day_of_week': fields[4],
-        }
+        return _parse_cron_expr(cron_expr)
 
     async def terminate(self):
         """插件卸载/重载时的清理工作"""
@@ -94,20 +310,71 @@ class RssPlugin(Star):
         except Exception as e:
             self.logger.error(f'停止RSS插件调度器时发生错误: {e}')
 
+        # 发送尚未发出的合并推送
+        for handle in self.push_flush_handles.values():
+            handle.cancel()
+        for user in list(self.pending_pushes):
+            await self._flush_push(user)
+
+        # 写入尚未保存的数据
+        try:
+            self.data_handler.flush()
+        except Exception as e:
+            self.logger.error(f'保存RSS插件数据时发生错误: {e}')
+
+        await self.pic_handler.close()
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的 HTTP 会话，所有订阅源和图片/视频下载复用同一个连接池（keep-alive / DNS 缓存）"""
+        if self.http_session is None or self.http_session.closed:
+            # 连接器保持默认的证书校验，图片/视频下载仍会校验 TLS；仅订阅源请求单独关闭校验
+            connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=600)
+            timeout = aiohttp.ClientTimeout(total=30, connect=10)
+            self.http_session = aiohttp.ClientSession(
+                trust_env=True, connector=connector, timeout=timeout, headers=_FEED_REQUEST_HEADERS
+            )
+        return self.http_session
+
     async def parse_channel_info(self, url):
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        connector = aiohttp.TCPConnector(ssl=False)
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
+        result = await self._request_feed(url)
+        return result[1] if result else None
+
+    async def _request_feed(
+        self,
+        url: str,
+        etag: str = '',
+        last_modified: str = '',
+        on_chunk: Optional[Callable[[bytes], Awaitable[None]]] = None,
+    ) -> Optional[Tuple[int, Optional[bytes], str, str]]:
+        """
+        请求订阅源，提供 ETag / Last-Modified 时发送条件请求
+        提供 on_chunk 时以流的形式逐块交给调用方处理，不再缓存完整内容
+        Returns:
+            (状态码, 内容, ETag, Last-Modified)，未变化(304)或流式读取时内容为 None；请求失败返回 None
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        session = self._get_session()
         try:
-            async with aiohttp.ClientSession(
-                trust_env=True, connector=connector, timeout=timeout, headers=headers
-            ) as session:
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        self.logger.error(f'rss: 无法正常打开站点 {url}')
-                        return None
+            async with session.get(url, headers=headers, ssl=False) as resp:
+                if resp.status == 304:
+                    return 304, None, etag, last_modified
+                if resp.status != 200:
+                    self.logger.error(f'rss: 无法正常打开站点 {url}')
+                    return None
+                if on_chunk is None:
                     text = await resp.read()
-                    return text
+                else:
+                    text = None
+                    async for chunk in resp.content.iter_chunked(_FEED_CHUNK_SIZE):
+                        await on_chunk(chunk)
+                return 200, text, resp.headers.get('ETag', ''), resp.headers.get('Last-Modified', '')
         except asyncio.TimeoutError:
             self.logger.error(f'rss: 请求站点 {url} 超时')
             return None
@@ -123,24 +390,19 @@ class RssPlugin(Star):
         统一发送消息方法，包含风控重试逻辑
         """
 
-        # 辅助函数：旋转单个组件（如果它是图片）
-        def _try_rotate_component(component) -> bool:
+        # 辅助函数：获取图片组件对应的本地文件路径
+        def _image_path(component) -> Optional[str]:
             if isinstance(component, Comp.Image) and component.file:
                 file_path = component.file
                 if file_path.startswith('file://'):
                     file_path = file_path.replace('file://', '')
-                return self.pic_handler.rotate_image_180(file_path)
-            return False
+                return file_path
+            return None
 
-        # 辅助函数：处理 Node 内部的内容
-        def _process_node_content(node_component) -> bool:
-            rotated = False
+        # 辅助函数：收集 Node 内部的内容
+        def _node_content(node_component) -> list:
             node_content = getattr(node_component, 'content', [])
-            if isinstance(node_content, list):
-                for sub_comp in node_content:
-                    if _try_rotate_component(sub_comp):
-                        rotated = True
-            return rotated
+            return node_content if isinstance(node_content, list) else []
 
         try:
             await self.context.send_message(user, message_chain)
@@ -149,22 +411,26 @@ class RssPlugin(Star):
             if e.retcode == 1200:
                 self.logger.warning(f'[RSS] 发送失败(Retcode 1200/Timeout)，疑似风控，尝试旋转图片重试...')
 
-                has_rotated = False
-                # 遍历消息链，找到所有图片组件
+                # 遍历消息链，收集所有可能是图片的组件
+                candidates = []
                 for component in message_chain.chain:
-                    # 1. 直接是图片
-                    if _try_rotate_component(component):
-                        has_rotated = True
-                    # 2. 是 Nodes 容器，合并转发
-                    elif isinstance(component, Comp.Nodes):
+                    # 1. 是 Nodes 容器，合并转发
+                    if isinstance(component, Comp.Nodes):
                         # 遍历容器内的所有 Node
                         for sub_node in component.nodes:
-                            if _process_node_content(sub_node):
-                                has_rotated = True
-                    # 3. 是 Node 单个节点，单条转发
+                            candidates.extend(_node_content(sub_node))
+                    # 2. 是 Node 单个节点，单条转发
                     elif isinstance(component, Comp.Node):
-                        if _process_node_content(component):
-                            has_rotated = True
+                        candidates.extend(_node_content(component))
+                    # 3. 直接是图片
+                    else:
+                        candidates.append(component)
+
+                # 同一文件只旋转一次
+                image_paths = dict.fromkeys(path for path in map(_image_path, candidates) if path)
+                # 并行旋转，旋转在线程中执行，不阻塞事件循环
+                results = await asyncio.gather(*(self.pic_handler.rotate_image_180(path) for path in image_paths))
+                has_rotated = any(results)
 
                 if has_rotated:
                     try:
@@ -200,288 +466,329 @@ class RssPlugin(Star):
         last_update = sub_info['last_update']
         latest_link = sub_info['latest_link']
         max_items_per_poll = self.max_items_per_poll
-        # 拉取 RSS
+        # 已推送过的条目标识哈希
+        sent_ids = sub_info.get('sent_ids', [])
+        # 拉取 RSS，跳过已经推送过的条目，避免重复下载图片和重复推送
         rss_items = await self.poll_rss(
             url,
             num=max_items_per_poll,
             after_timestamp=last_update,
             after_link=latest_link,
+            exclude_ids=frozenset(sent_ids),
         )
 
         self.logger.info(f'{log_prefix} 拉取完成，获取到 {len(rss_items)} 条新内容')
-        max_ts = last_update
-
-        # 处理消息发送
-        if self.is_compose:
-            # 合并转发模式
-            node_list = []
-            for item in rss_items:
-                main_comps, video_comp = await self._get_chain_components(item)
-
-                # 1. 文本和图片
-                node = Comp.Node(uin=0, name='Astrbot', content=main_comps)
-                node_list.append(node)
-
-                # 2. 视频单独作为一个Node
-                if video_comp:
-                    video_node = Comp.Node(uin=0, name='Astrbot', content=[video_comp])
-                    node_list.append(video_node)
-
-                if item.pubDate_timestamp > max_ts:
-                    max_ts = item.pubDate_timestamp
-
-            if len(node_list) > 0:
-                # 使用 Comp.Nodes 将列表包装成一个“合并转发容器组件”
-                nodes_container = Comp.Nodes(node_list)
-                # 构造消息链：必须包含容器组件，且关闭 t2i
-                msc = MessageChain(chain=[nodes_container], use_t2i_=False)
-                self.logger.info(f'{log_prefix} 正在发送合并消息 (包含 {len(node_list)} 条)...')
-                # 调用统一发送方法
-                await self._safe_send_message(user, msc)
-        else:
-            # 逐条发送模式
-            for idx, item in enumerate(rss_items):
-                main_comps, video_comp = await self._get_chain_components(item)
 
-                # 发送主体内容
-                msc = MessageChain(chain=main_comps, use_t2i_=self.t2i)
-                await self._safe_send_message(user, msc)
+        # 处理消息发送，发送完成前不淘汰已下载的图片/视频
+        with self.pic_handler.hold_cached_files():
+            if self.is_compose:
+                # 合并转发模式
+                node_list = []
+                for item in rss_items:
+                    main_comps, video_comp = await self._get_chain_components(item)
+                    node_list.extend(_build_nodes(main_comps, video_comp))
+
+                if len(node_list) > 0 and self.is_merge_push:
+                    # 同一时刻多个订阅的更新合并为一条消息，稍后统一发送
+                    self._queue_push(user, node_list)
+                elif len(node_list) > 0:
+                    # 使用 Comp.Nodes 将列表包装成一个“合并转发容器组件”
+                    nodes_container = Comp.Nodes(node_list)
+                    # 构造消息链：必须包含容器组件，且关闭 t2i
+                    msc = MessageChain(chain=[nodes_container], use_t2i_=False)
+                    self.logger.info(f'{log_prefix} 正在发送合并消息 (包含 {len(node_list)} 条)...')
+                    # 调用统一发送方法
+                    await self._safe_send_message(user, msc)
+            else:
+                # 逐条发送模式
+                for idx, item in enumerate(rss_items):
+                    main_comps, video_comp = await self._get_chain_components(item)
 
-                # 如果有视频，单独发送一条消息
-                if video_comp:
-                    video_msc = MessageChain(chain=[video_comp], use_t2i_=False)
-                    await self._safe_send_message(user, video_msc)
+                    # 发送主体内容
+                    msc = MessageChain(chain=main_comps, use_t2i_=self.t2i)
+                    await self._safe_send_message(user, msc)
 
-                self.logger.info(f'{log_prefix} 第 {idx + 1}/{len(rss_items)} 条已发送')
+                    # 如果有视频，单独发送一条消息
+                    if video_comp:
+                        video_msc = MessageChain(chain=[video_comp], use_t2i_=False)
+                        await self._safe_send_message(user, video_msc)
 
-                # 只记录 item 的时间戳，不使用系统时间
-                if item.pubDate_timestamp > max_ts:
-                    max_ts = item.pubDate_timestamp
+                    self.logger.info(f'{log_prefix} 第 {idx + 1}/{len(rss_items)} 条已发送')
 
         # 更新最后更新时间
         if rss_items:
+            # 只记录 item 的时间戳，不使用系统时间
+            max_ts = max(last_update, max(item.pubDate_timestamp for item in rss_items))
             # 只有当确实处理了消息，才更新数据库
             self.data_handler.data[url]['subscribers'][user]['last_update'] = max_ts
             # 更新最新链接作为双重校验
             self.data_handler.data[url]['subscribers'][user]['latest_link'] = rss_items[0].link
-            self.data_handler.save_data()
+            # 记录最近推送过的条目标识哈希
+            sent_ids.extend(_item_id_hash(item) for item in rss_items)
+            sub_info['sent_ids'] = sent_ids[-_MAX_SENT_IDS:]
+            self.data_handler.mark_dirty()
             self.logger.info(f'RSS 定时任务 {url} 推送成功 - {user}，更新时间至: {max_ts}')
         else:
             self.logger.info(f'RSS 定时任务 {url} 无消息更新 - {user}')
 
-    async def _fetch_and_parse_feed(self, url: str) -> List[RSSItem]:
-        """
-        [内部方法] 执行实际的网络请求并解析所有 RSS 条目
-        不执行任何过滤（时间戳/数量），只负责解析并返回对象列表
-        """
-        text = await self.parse_channel_info(url)
-        if text is None:
-            self.logger.error(f'rss: 无法解析站点 {url} 的RSS信息')
-            return []
+    def _queue_push(self, user: str, node_list: List):
+        """将合并转发节点加入用户的待发送队列，短时间内没有新的更新后一并发送"""
+        if user not in self.pending_pushes:
+            # 队列中的图片/视频在发送前不能被淘汰，发送后在 _flush_push 中释放
+            self.pic_handler.acquire_cached_files()
+        self.pending_pushes.setdefault(user, []).extend(node_list)
+        handle = self.push_flush_handles.get(user)
+        if handle is not None:
+            handle.cancel()
+        self.push_flush_handles[user] = asyncio.get_running_loop().call_later(
+            _PUSH_MERGE_DELAY, self._start_flush_push, user
+        )
 
+    def _start_flush_push(self, user: str):
+        task = asyncio.ensure_future(self._flush_push(user))
+        # 持有任务引用，避免任务在完成前被回收
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    async def _flush_push(self, user: str):
+        """发送用户待发送队列中的所有节点"""
+        self.push_flush_handles.pop(user, None)
+        node_list = self.pending_pushes.pop(user, None)
+        if node_list is None:
+            return
         try:
-            root = etree.fromstring(text)
-        except Exception as e:
-            self.logger.error(f'rss: XML解析失败 {url}: {str(e)}')
-            return []
+            msc = MessageChain(chain=[Comp.Nodes(node_list)], use_t2i_=False)
+            self.logger.info(f'[RSS][{user}] 正在发送合并消息 (包含 {len(node_list)} 条)...')
+            await self._safe_send_message(user, msc)
+        finally:
+            self.pic_handler.release_cached_files()
 
+    async def _fetch_and_parse_feed(self, url: str, cache_data: Optional[Dict] = None) -> Dict:
+        """
+        [内部方法] 执行实际的网络请求并解析所有 RSS 条目，返回新的缓存条目
+        不执行任何过滤（时间戳/数量），只负责解析
+        订阅源未变化(304)时直接复用缓存中已解析的条目
+        """
+        etag = cache_data.get('etag', '') if cache_data else ''
+        last_modified = cache_data.get('last_modified', '') if cache_data else ''
+
+        # 边下载边解析，解析与网络传输重叠进行
+        parser = self._create_feed_parser(url)
+        # 限制同时进行的订阅源请求数量
+        async with self.fetch_semaphore:
+            result = await self._request_feed(url, etag, last_modified, parser.feed_chunk_async)
+        if result is None:
+            self.logger.error(f'rss: 无法解析站点 {url} 的RSS信息')
+            return {'items': ()}
+
+        status, _, etag, last_modified = result
+        items = cache_data['items'] if status == 304 else tuple(parser.close())
+        return {'items': items, 'etag': etag, 'last_modified': last_modified}
+
+    def _parse_feed(self, url: str, text: bytes, chan_title: Optional[str] = None) -> List[RSSItem]:
+        """解析订阅源内容中的所有条目"""
+        parser = self._create_feed_parser(url, chan_title)
+        parser.feed_chunk(text)
+        return parser.close()
+
+    def _create_feed_parser(self, url: str, chan_title: Optional[str] = None) -> '_FeedParser':
+        """创建增量解析器，可以边下载边解析订阅源"""
+        if chan_title is None:
+            # 获取频道标题，用于填充 RSSItem
+            chan_title = self.data_handler.data[url]['info']['title'] if url in self.data_handler.data else '未知频道'
+        return _FeedParser(self, url, chan_title)
+
+    def _parse_feed_item(self, item, url: str, chan_title: str) -> RSSItem:
+        """解析单个 RSS item / Atom entry 节点"""
+        data_handler = self.data_handler
+        qname = etree.QName(item)
         # 检测是RSS还是Atom
-        is_atom = root.tag.endswith('feed') or 'atom' in root.tag.lower()
-
-        # 根据格式选择item路径
-        if is_atom:
-            items = root.xpath("//*[local-name()='entry']")
-        else:
-            items = root.xpath('//item')
-
-        rss_items_list = []
-
-        # 获取频道标题，用于填充 RSSItem
-        chan_title = self.data_handler.data[url]['info']['title'] if url in self.data_handler.data else '未知频道'
-
-        for item in items:
-            try:
-                # 提取标题
-                if is_atom:
-                    title_elem = item.xpath("*[local-name()='title']")
-                else:
-                    title_elem = item.xpath('title')
-
-                title = title_elem[0].text if title_elem and title_elem[0].text else '无标题'
-                if len(title) > self.title_max_length:
-                    title = title[: self.title_max_length] + '...'
-
-                # 提取链接
-                if is_atom:
-                    link_elem = item.xpath("*[local-name()='link']/@href")
-                    link = link_elem[0] if link_elem else ''
-                else:
-                    link_elem = item.xpath('link')
-                    link = link_elem[0].text if link_elem and link_elem[0].text else ''
-
-                if link and not re.match(r'^https?://', link):
-                    link = self.data_handler.get_root_url(url) + link
-
-                # 提取描述/内容 - 优先使用完整内容
-                content = ''
-                description = ''
-                summary = ''
-
-                if is_atom:
-                    # Atom格式 - 使用local-name()
-                    content_elem = item.xpath("*[local-name()='content']")
-                    summary_elem = item.xpath("*[local-name()='summary']")
-
-                    if content_elem and content_elem[0].text:
-                        content = content_elem[0].text
-                    if summary_elem and summary_elem[0].text:
-                        summary = summary_elem[0].text
-                    description = content or summary
-                else:
-                    # RSS格式
-                    desc_elem = item.xpath('description')
-                    # 尝试获取content:encoded(更完整的内容)
-                    content_elem = item.xpath("*[local-name()='encoded']")
-
-                    if content_elem and content_elem[0].text:
-                        content = content_elem[0].text
-                    if desc_elem and desc_elem[0].text:
-                        description = desc_elem[0].text
-
-                # 提取作者
-                author = ''
+        is_atom = qname.localname == 'entry'
+        ns = f'{{{qname.namespace}}}' if qname.namespace else ''
+        fields = _item_fields(ns, is_atom)
+
+        # 单次遍历子节点，记录每个字段第一次出现的节点
+        first = {}
+        link = ''
+        categories = []
+        for child in item:
+            tag = child.tag
+            if not isinstance(tag, str):
+                # 注释 / 处理指令
+                continue
+            field = fields.get(tag)
+            if field is None:
                 if is_atom:
-                    author_elem = item.xpath("*[local-name()='author']/*[local-name()='name']")
-                    if author_elem and author_elem[0].text:
-                        author = author_elem[0].text
-                else:
-                    author_elem = item.xpath('author') or item.xpath("*[local-name()='creator']")
-                    if author_elem and author_elem[0].text:
-                        author = author_elem[0].text
+                    continue
+                field = tag.rpartition('}')[2]
+                if field not in _RSS_ANY_NS_FIELDS:
+                    continue
 
+            if field == 'category':
                 # 提取分类
-                categories = []
-                if is_atom:
-                    cat_elems = item.xpath("*[local-name()='category']/@term")
-                    categories = list(cat_elems)
-                else:
-                    cat_elems = item.xpath('category')
-                    categories = [cat.text for cat in cat_elems if cat.text]
-
-                # 提取附件(enclosure)
-                enclosure_url = ''
-                enclosure_type = ''
-                enclosure_elem = item.xpath('enclosure')
-                if enclosure_elem:
-                    enclosure_url = enclosure_elem[0].get('url', '')
-                    enclosure_type = enclosure_elem[0].get('type', '')
-
-                # 提取评论链接
-                comments_url = ''
-                comments_elem = item.xpath('comments')
-                if comments_elem and comments_elem[0].text:
-                    comments_url = comments_elem[0].text
-
-                # 提取GUID
-                guid = ''
-                if is_atom:
-                    guid_elem = item.xpath("*[local-name()='id']")
-                    if guid_elem and guid_elem[0].text:
-                        guid = guid_elem[0].text
-                else:
-                    guid_elem = item.xpath('guid')
-                    if guid_elem and guid_elem[0].text:
-                        guid = guid_elem[0].text
-
-                # 处理内容 - 使用完整内容或描述
-                full_content = content or description
-
-                # 使用 extract_media_urls 来全面提取图片和视频
-                media_data = self.data_handler.extract_media_urls(full_content)
-                pic_url_list = media_data['images']
-
-                # 如果原生没有附件，但 HTML 中提取到了视频，则将第一个视频作为附件
-                if not enclosure_url and media_data['videos']:
-                    enclosure_url = media_data['videos'][0]
-                    enclosure_type = 'video/mp4'  # 假设为 mp4，后续下载会校验
-
-                # 清理HTML得到纯文本描述
-                clean_description = self.data_handler.strip_html(description or content)
-                clean_description = self.data_handler.smart_truncate(clean_description, self.description_max_length)
+                value = child.get('term') if is_atom else child.text
+                if value:
+                    categories.append(value)
+            elif field == 'link' and is_atom:
+                # Atom 取第一个带 href 的链接
+                if not link:
+                    link = child.get('href', '')
+            elif field == 'author' and is_atom:
+                # Atom 作者为 author/name，取第一个带 name 的作者
+                if 'author' not in first:
+                    name_elem = child.find(ns + 'name')
+                    if name_elem is not None:
+                        first['author'] = name_elem
+            elif field not in first:
+                first[field] = child
+
+        def child_text(field: str) -> str:
+            child = first.get(field)
+            return child.text if child is not None and child.text else ''
+
+        # 提取标题
+        title = child_text('title') or '无标题'
+        title_max_length = self.title_max_length
+        if len(title) > title_max_length:
+            title = title[:title_max_length] + '...'
+
+        # 提取链接
+        if not is_atom:
+            link = child_text('link')
+
+        if link and not link.startswith(_URL_SCHEMES):
+            link = data_handler.get_root_url(url) + link
+
+        # 提取描述/内容 - 优先使用完整内容
+        summary = ''
+        if is_atom:
+            content = child_text('content')
+            summary = child_text('summary')
+            description = content or summary
+        else:
+            description = child_text('description')
+            # 尝试获取content:encoded(更完整的内容)
+            content = child_text('encoded')
 
-                # 保留完整内容
-                clean_content = self.data_handler.strip_html(content) if content else ''
+        # 提取作者
+        if is_atom:
+            author = child_text('author')
+        else:
+            author = child_text('author') or child_text('creator')
+
+        # 提取附件(enclosure)
+        enclosure_url = ''
+        enclosure_type = ''
+        enclosure_elem = first.get('enclosure')
+        if enclosure_elem is not None:
+            enclosure_url = enclosure_elem.get('url', '')
+            enclosure_type = enclosure_elem.get('type', '')
+
+        # 提取评论链接
+        comments_url = child_text('comments')
+
+        # 提取GUID
+        guid = child_text('id') if is_atom else child_text('guid')
+
+        # 处理内容 - 使用完整内容或描述，同一段HTML只解析一次
+        if content:
+            clean_content, media_data = data_handler.parse_entry(content)
+            if description and description != content:
+                clean_description = data_handler.strip_html(description)
+            else:
+                clean_description = clean_content
+        else:
+            clean_content = ''
+            clean_description, media_data = data_handler.parse_entry(description)
+        pic_url_list = media_data['images']
 
-                # 提取日期
-                pub_date = ''
-                pub_date_timestamp = 0
+        # 如果原生没有附件，但 HTML 中提取到了视频，则将第一个视频作为附件
+        if not enclosure_url and media_data['videos']:
+            enclosure_url = media_data['videos'][0]
+            enclosure_type = 'video/mp4'  # 假设为 mp4，后续下载会校验
 
-                if is_atom:
-                    date_elem = item.xpath("*[local-name()='updated']") or item.xpath("*[local-name()='published']")
-                    if date_elem and date_elem[0].text:
-                        pub_date = date_elem[0].text
-                else:
-                    date_elem = item.xpath('pubDate')
-                    if date_elem and date_elem[0].text:
-                        pub_date = date_elem[0].text
-
-                # 解析日期
-                if pub_date:
-                    pub_date_timestamp = self._parse_date(pub_date)
-
-                # 将解析好的对象加入列表
-                rss_items_list.append(
-                    RSSItem(
-                        chan_title=chan_title,
-                        title=title,
-                        link=link,
-                        description=clean_description,
-                        pubDate=pub_date,
-                        pubDate_timestamp=pub_date_timestamp,
-                        pic_urls=pic_url_list,
-                        author=author,
-                        categories=categories,
-                        content=clean_content,
-                        summary=summary,
-                        enclosure_url=enclosure_url,
-                        enclosure_type=enclosure_type,
-                        comments_url=comments_url,
-                        guid=guid,
-                    )
-                )
+        # 截断纯文本描述
+        clean_description = data_handler.smart_truncate(clean_description, self.description_max_length)
 
-            except Exception as e:
-                self.logger.error(f'rss: 解析Rss条目 {url} 失败: {str(e)}')
-                continue
-
-        return rss_items_list
+        # 提取日期
+        if is_atom:
+            pub_date = child_text('updated') or child_text('published')
+        else:
+            pub_date = child_text('pubDate')
+
+        # 解析日期
+        pub_date_timestamp = self._parse_date(pub_date) if pub_date else 0
+
+        return RSSItem(
+            chan_title=chan_title,
+            title=title,
+            link=link,
+            description=clean_description,
+            pubDate=pub_date,
+            pubDate_timestamp=pub_date_timestamp,
+            pic_urls=tuple(pic_url_list),
+            author=author,
+            categories=tuple(categories),
+            content=clean_content,
+            summary=summary,
+            enclosure_url=enclosure_url,
+            enclosure_type=enclosure_type,
+            comments_url=comments_url,
+            guid=guid,
+        )
 
-    async def _get_feed_data_safe(self, url: str) -> List[RSSItem]:
+    async def _get_feed_data_safe(self, url: str) -> Tuple[RSSItem, ...]:
         """
-        获取 Feed 数据，带有 缓存 和 锁 机制
+        获取 Feed 数据，带有 缓存 和 请求合并(single-flight) 机制
         """
-        # 1. 确保每个 URL 都有一个对应的锁，防止并发请求
-        if url not in self.fetch_locks:
-            self.fetch_locks[url] = asyncio.Lock()
-
-        # 2. 上锁
-        async with self.fetch_locks[url]:
-            current_time = time.time()
-
-            # 3. 检查缓存是否有效
-            if url in self.feed_cache:
-                cache_data = self.feed_cache[url]
-                # 如果缓存时间在有效期内（例如60秒），直接返回
-                if current_time - cache_data['ts'] < self.cache_timeout:
-                    # self.logger.debug(f"[RSS] Hit cache for {url}")
-                    return cache_data['items']
-
-            # 4. 缓存失效或不存在，执行网络请求
-            items = await self._fetch_and_parse_feed(url)
-
-            # 5. 更新缓存
-            self.feed_cache[url] = {'ts': current_time, 'items': items}
+        current_time = time.time()
+
+        # 1. 检查缓存是否有效，命中时无需等待任何请求
+        cache_data = self.feed_cache.get(url)
+        if cache_data and current_time - cache_data['ts'] < self.cache_timeout:
+            self.feed_cache.move_to_end(url)
+            return cache_data['items']
+
+        # 2. 同一 URL 已有请求在进行中，直接等待其结果，不再重复请求
+        inflight = self.inflight_fetches.get(url)
+        if inflight is not None:
+            # shield: 等待方被取消时不影响正在进行的请求
+            return await asyncio.shield(inflight)
+
+        # 3. 缓存失效或不存在，执行网络请求，并发的调用方共享同一个 Future
+        fut = asyncio.get_running_loop().create_future()
+        # 没有等待方时也标记异常已读取，避免 "exception was never retrieved" 警告
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.inflight_fetches[url] = fut
+        try:
+            entry = await self._fetch_and_parse_feed(url, cache_data)
+        except asyncio.CancelledError:
+            # 不能直接取消 Future，否则等待方会收到并非针对自身的 CancelledError
+            fut.set_exception(RuntimeError(f'请求订阅源 {url} 被取消'))
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        else:
+            # 4. 更新缓存
+            self._cache_feed(url, entry, current_time)
+            items = entry['items']
+            fut.set_result(items)
             return items
+        finally:
+            self.inflight_fetches.pop(url, None)
+
+    def _cache_feed(self, url: str, entry: Dict, ts: float):
+        """写入订阅源缓存，超出容量时淘汰最久未使用的订阅源"""
+        entry['ts'] = ts
+        old_entry = self.feed_cache.get(url)
+        if old_entry is not None and old_entry['items'] is entry['items'] and 'filtered' in old_entry:
+            # 条目未变化(304)时沿用已有的过滤结果
+            entry['filtered'] = old_entry['filtered']
+        self.feed_cache[url] = entry
+        self.feed_cache.move_to_end(url)
+        while len(self.feed_cache) > self.cache_max_entries:
+            self.feed_cache.popitem(last=False)
 
     async def poll_rss(
         self,
@@ -489,40 +796,51 @@ class RssPlugin(Star):
         num: int = -1,
         after_timestamp: int = 0,
         after_link: str = '',
+        exclude_ids: frozenset = frozenset(),
     ) -> List[RSSItem]:
         """
         从站点拉取RSS信息 (优化版)
         先从缓存/网络获取全量数据，再根据 timestamp 进行过滤
+        exclude_ids 为已推送条目的标识哈希，在截取前 num 条之前跳过，避免旧条目挤占名额
         """
         # 获取全量条目（带缓存）
         all_items = await self._get_feed_data_safe(url)
 
+        # 同一订阅源的多个订阅者条件相同时，直接复用过滤结果
+        # 过滤结果存放在当前的订阅源缓存条目中，订阅源刷新或被淘汰后自动失效
+        filter_key = (num, after_timestamp, after_link, exclude_ids)
+        filtered_cache = None
+        cache_entry = self.feed_cache.get(url)
+        if cache_entry is not None and cache_entry['items'] is all_items:
+            filtered_cache = cache_entry.setdefault('filtered', {})
+            cached = filtered_cache.get(filter_key)
+            if cached is not None:
+                return list(cached)
+
         filtered_items = []
-        cnt = 0
 
         # 遍历全量条目进行过滤
         for item in all_items:
-            is_new = False
-
-            # 判断是否为新内容
-            if item.pubDate_timestamp > 0:
+            ts = item.pubDate_timestamp
+            if ts > 0:
                 # 时间戳必须严格大于上次更新时间
-                is_new = item.pubDate_timestamp > after_timestamp
-            else:
+                if ts <= after_timestamp:
+                    # 假设 RSS 是按时间倒序排列的，一旦遇到旧消息，后面的肯定更旧
+                    # 注意：如果 RSS 乱序，这里可能需要调整，但标准 RSS 默认是有序的
+                    break
+            elif item.link == after_link:
                 # 无时间戳退化为链接判断
-                is_new = item.link != after_link
+                continue
 
-            if is_new:
-                filtered_items.append(item)
-                cnt += 1
-                if num != -1 and cnt >= num:
-                    break
-            elif item.pubDate_timestamp > 0:
-                # 假设 RSS 是按时间倒序排列的，一旦遇到旧消息，后面的肯定更旧
-                # 注意：如果 RSS 乱序，这里可能需要调整，但标准 RSS 默认是有序的
-                if item.pubDate_timestamp <= after_timestamp:
-                    break
+            if exclude_ids and _item_id_hash(item) in exclude_ids:
+                continue
+
+            filtered_items.append(item)
+            if num != -1 and len(filtered_items) >= num:
+                break
 
+        if filtered_cache is not None:
+            filtered_cache[filter_key] = tuple(filtered_items)
         return filtered_items
 
     def _parse_date(self, date_str: str) -> int:
@@ -530,43 +848,19 @@ class RssPlugin(Star):
         if not date_str:
             return 0
 
-        # 常见日期格式
-        date_formats = [
-            '%a, %d %b %Y %H:%M:%S %z',  # RSS标准: Wed, 02 Oct 2002 13:00:00 GMT
-            '%a, %d %b %Y %H:%M:%S GMT',  # RSS GMT格式
-            '%Y-%m-%dT%H:%M:%S%z',  # ISO 8601: 2002-10-02T13:00:00+00:00
-            '%Y-%m-%dT%H:%M:%SZ',  # ISO 8601 UTC: 2002-10-02T13:00:00Z
-            '%Y-%m-%dT%H:%M:%S.%f%z',  # ISO 8601带毫秒
-            '%Y-%m-%dT%H:%M:%S.%fZ',  # ISO 8601 UTC带毫秒
-            '%Y-%m-%d %H:%M:%S',  # 简单格式
-            '%Y/%m/%d %H:%M:%S',  # 斜杠分隔
-        ]
-
-        # 预处理
-        date_str = date_str.strip()
-        if 'GMT' in date_str:
-            date_str = date_str.replace('GMT', '+0000')
-
         current_ts = int(time.time())
-        for fmt in date_formats:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                ts = int(dt.timestamp())
-
-                # 未来时间防护：超过1小时的未来时间视为异常，修正为当前时间
-                if ts > current_ts + 3600:
-                    return current_ts
-                return ts
-            except ValueError:
-                continue
+        ts = _parse_timestamp(date_str.strip())
+        if ts is None:
+            return current_ts
 
-        return current_ts
+        # 未来时间防护：超过1小时的未来时间视为异常，修正为当前时间
+        if ts > current_ts + 3600:
+            return current_ts
+        return ts
 
     def parse_rss_url(self, url: str) -> str:
         """解析RSS URL，确保以http或https开头"""
-        if not re.match(r'^https?://', url):
+        if not url.startswith(_URL_SCHEMES):
             if not url.startswith('/'):
                 url = '/' + url
             url = 'https://' + url
@@ -581,28 +875,14 @@ class RssPlugin(Star):
 
         # 2. 收集所有活跃的订阅任务ID
         for url, info in self.data_handler.data.items():
-            if url in ['rsshub_endpoints', 'settings']:
+            if url in RESERVED_KEYS:
                 continue
 
             for user, sub_info in info['subscribers'].items():
                 # 构造唯一 ID：URL + User
                 job_id = f'{url}|{user}'
                 active_job_ids.add(job_id)
-
-                try:
-                    # 添加或更新任务
-                    # id: 指定固定ID
-                    # replace_existing: 如果任务已存在，则更新触发参数
-                    self.scheduler.add_job(
-                        self.cron_task_callback,
-                        'cron',
-                        **self.parse_cron_expr(sub_info['cron_expr']),
-                        args=[url, user],
-                        id=job_id,
-                        replace_existing=True,
-                    )
-                except Exception as e:
-                    self.logger.error(f'添加定时任务失败 {job_id}: {str(e)}')
+                self._schedule_subscription(url, user, sub_info['cron_expr'])
 
         # 3. 清理已经不再配置中的废弃任务
         # 获取调度器中当前所有的任务
@@ -615,9 +895,40 @@ class RssPlugin(Star):
                     self.logger.info(f'清理废弃任务: {job.id}')
                 except Exception as e:
                     self.logger.error(f'清理废弃任务失败 {job.id}: {str(e)}')
+        for job_id in self.applied_jobs.keys() - active_job_ids:
+            del self.applied_jobs[job_id]
 
         self.logger.info(f'定时任务刷新完成，当前运行任务数: {len(self.scheduler.get_jobs())}')
 
+    def _schedule_subscription(self, url: str, user: str, cron_expr: str):
+        """添加(或更新)单个订阅的定时任务，任务已存在且 cron 表达式未变化时跳过"""
+        job_id = f'{url}|{user}'
+        if self.applied_jobs.get(job_id) == cron_expr and self.scheduler.get_job(job_id) is not None:
+            return
+
+        try:
+            # 添加或更新任务
+            # id: 指定固定ID
+            # replace_existing: 如果任务已存在，则更新触发参数
+            self.scheduler.add_job(
+                self.cron_task_callback,
+                'cron',
+                **self.parse_cron_expr(cron_expr),
+                args=[url, user],
+                id=job_id,
+                replace_existing=True,
+            )
+            self.applied_jobs[job_id] = cron_expr
+        except Exception as e:
+            self.logger.error(f'添加定时任务失败 {job_id}: {str(e)}')
+
+    def _unschedule_subscription(self, url: str, user: str):
+        """删除单个订阅的定时任务"""
+        job_id = f'{url}|{user}'
+        self.applied_jobs.pop(job_id, None)
+        if self.scheduler.get_job(job_id) is not None:
+            self.scheduler.remove_job(job_id)
+
     def _add_cleanup_job(self):
         """添加清理临时文件的定时任务"""
         try:
@@ -648,45 +959,49 @@ class RssPlugin(Star):
                 replace_existing=True,
             )
 
-    async def _add_url(self, url: str, cron_expr: str, message: AstrMessageEvent):
+    async def _add_url(self, url: str, cron_expr: str, message: AstrMessageEvent) -> _AddResult:
         """内部方法:添加URL订阅的共用逻辑"""
         user = message.unified_msg_origin
+        channel_info = None
         if url in self.data_handler.data:
             latest_item = await self.poll_rss(url)
             if not latest_item:
-                return message.plain_result(f'无法获取RSS内容,请检查URL是否正确')
-            self.data_handler.data[url]['subscribers'][user] = {
-                'cron_expr': cron_expr,
-                'last_update': latest_item[0].pubDate_timestamp,
-                'latest_link': latest_item[0].link,
-            }
+                return _AddResult(error=message.plain_result(f'无法获取RSS内容,请检查URL是否正确'))
         else:
             try:
-                text = await self.parse_channel_info(url)
-                if text is None:
-                    return message.plain_result(f'无法访问该RSS源,请检查URL是否正确')
+                result = await self._request_feed(url)
+                if result is None:
+                    return _AddResult(error=message.plain_result(f'无法访问该RSS源,请检查URL是否正确'))
+                _, text, etag, last_modified = result
                 title, desc = self.data_handler.parse_channel_text_info(text)
+                # 复用已下载的内容解析条目并写入缓存，无需再次请求
+                if len(text) >= _THREAD_PARSE_THRESHOLD:
+                    items = tuple(await asyncio.to_thread(self._parse_feed, url, text, title))
+                else:
+                    items = tuple(self._parse_feed(url, text, title))
+                self._cache_feed(url, {'items': items, 'etag': etag, 'last_modified': last_modified}, time.time())
                 latest_item = await self.poll_rss(url)
                 if not latest_item:
-                    return message.plain_result(f'RSS源无可用内容,请检查URL是否正确')
+                    return _AddResult(error=message.plain_result(f'RSS源无可用内容,请检查URL是否正确'))
             except Exception as e:
-                return message.plain_result(f'解析频道信息失败: {str(e)}')
-
-            self.data_handler.data[url] = {
-                'subscribers': {
-                    user: {
-                        'cron_expr': cron_expr,
-                        'last_update': latest_item[0].pubDate_timestamp,
-                        'latest_link': latest_item[0].link,
-                    }
-                },
-                'info': {
-                    'title': title,
-                    'description': desc,
-                },
+                return _AddResult(error=message.plain_result(f'解析频道信息失败: {str(e)}'))
+            channel_info = {
+                'title': title,
+                'description': desc,
             }
-        self.data_handler.save_data()
-        return self.data_handler.data[url]['info']
+
+        self.data_handler.add_subscriber(
+            url,
+            user,
+            {
+                'cron_expr': cron_expr,
+                'last_update': latest_item[0].pubDate_timestamp,
+                'latest_link': latest_item[0].link,
+            },
+            channel_info,
+        )
+        self.data_handler.mark_dirty()
+        return _AddResult(self.data_handler.data[url]['info'])
 
     async def _get_chain_components(self, item: RSSItem) -> Tuple[List[any], Optional[any]]:
         """
@@ -695,15 +1010,8 @@ class RssPlugin(Star):
             Tuple[List[Component], Optional[Component]]: (主体消息组件列表, 视频组件(若有))
         """
         comps = []
-        # 收集所有的文本行
-        text_lines = []
         video_comp = None
 
-        # 标题和频道信息
-        text_lines.append(f'📰 {item.chan_title}')
-        text_lines.append('─' * 30)
-        text_lines.append(f'📌 {item.title}')
-
         # 添加作者和分类
         meta_info = []
         if item.author:
@@ -713,19 +1021,12 @@ class RssPlugin(Star):
             meta_info.append(f'🏷️ {", ".join(item.categories[:3])}')
         if item.pubDate and item.pubDate_timestamp > 0:
             # 格式化日期显示
-            try:
-                target_tz = ZoneInfo(self.time_zone)
-                dt = datetime.fromtimestamp(item.pubDate_timestamp, target_tz)
-                meta_info.append(f'🕒 {dt.strftime("%Y-%m-%d %H:%M")}')
-            except Exception as e:
-                self.logger.warning(f'[RSS] 时间格式化失败: {e}')
-                dt = datetime.fromtimestamp(item.pubDate_timestamp)
-                meta_info.append(f'🕒 {dt.strftime("%Y-%m-%d %H:%M")}')
+            dt = datetime.fromtimestamp(item.pubDate_timestamp, self.tz)
+            meta_info.append(f'🕒 {dt.strftime("%Y-%m-%d %H:%M")}')
 
-        if meta_info:
-            text_lines.append(' | '.join(meta_info))
-
-        text_lines.append('─' * 30)
+        # 标题、频道信息和元信息，空行分隔直接以 \n 前缀写入各段
+        meta_line = f'\n{" | ".join(meta_info)}' if meta_info else ''
+        text_lines = [f'📰 {item.chan_title}\n{_SEPARATOR}\n📌 {item.title}{meta_line}\n{_SEPARATOR}']
 
         # 内容 - 使用完整内容或描述
         content_text = item.get_display_content(self.description_max_length)
@@ -736,13 +1037,26 @@ class RssPlugin(Star):
         # 链接
         if not self.is_hide_url and item.link:
             # 添加一个空行做分隔
-            text_lines.append('')
-            text_lines.append(f'🔗 {item.link}')
+            text_lines.append(f'\n🔗 {item.link}')
+
+        # 先开始下载图片，与下面的视频下载同时进行
+        pic_urls = item.pic_urls
+        pic_count = len(pic_urls)
+        has_images = self.is_read_pic and pic_count > 0
+        if has_images:
+            # 如果max_pic_item为-1则不限制图片数量
+            temp_max_pic_item = pic_count if self.max_pic_item == -1 else self.max_pic_item
+            # 并发下载所有图片，结果保持原顺序
+            get_image_file = self.pic_handler.get_image_file
+            images_future = asyncio.gather(
+                *(get_image_file(pic_url) for pic_url in pic_urls[:temp_max_pic_item]),
+                return_exceptions=True,
+            )
 
         # 附件信息(音频/视频)
         if item.enclosure_url:
-            text_lines.append('')  # 空行分隔
-            enclosure_info = '📎 附件: '
+            # 空行分隔
+            enclosure_info = '\n📎 附件: '
             is_video = False
 
             if 'audio' in item.enclosure_type:
@@ -771,10 +1085,9 @@ class RssPlugin(Star):
             text_lines.append(f'💬 评论: {item.comments_url}')
 
         # 图片标题
-        has_images = self.is_read_pic and item.pic_urls
         if has_images:
-            text_lines.append('')  # 空行分隔
-            text_lines.append(f'📷 图片 ({len(item.pic_urls)}张):')
+            # 空行分隔
+            text_lines.append(f'\n📷 图片 ({pic_count}张):')
 
         # 生成文本
         final_text = '\n'.join(text_lines)
@@ -782,14 +1095,9 @@ class RssPlugin(Star):
 
         # 处理图片组件
         if has_images:
-            # 如果max_pic_item为-1则不限制图片数量
-            temp_max_pic_item = len(item.pic_urls) if self.max_pic_item == -1 else self.max_pic_item
-
-            for idx, pic_url in enumerate(item.pic_urls[:temp_max_pic_item], 1):
-                # 获取本地路径
-                file_path = await self.pic_handler.get_image_file(pic_url)
-
-                if file_path:
+            file_paths = await images_future
+            for idx, file_path in enumerate(file_paths, 1):
+                if file_path and not isinstance(file_path, BaseException):
                     # 使用 fromFileSystem 发送本地文件
                     comps.append(Comp.Image.fromFileSystem(file_path))
                 else:
@@ -797,8 +1105,8 @@ class RssPlugin(Star):
                     comps.append(Comp.Plain(f'\n[❌] 图{idx} 加载失败\n'))
 
             # 如果还有更多图片未显示
-            if len(item.pic_urls) > temp_max_pic_item:
-                count = len(item.pic_urls) - temp_max_pic_item
+            if pic_count > temp_max_pic_item:
+                count = pic_count - temp_max_pic_item
                 comps.append(Comp.Plain(f'\n... 还有 {count} 张图片未显示'))
 
         return comps, video_comp
@@ -807,9 +1115,13 @@ class RssPlugin(Star):
         """
         判断一个字符串是否为网址（http/https 开头）或 IP 地址。
         """
-        url_pattern = r'^(?:http|https)://.+$'
-        ip_pattern = r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-        return bool(re.match(url_pattern, text) or re.match(ip_pattern, text))
+        return _URL_OR_IP_RE.match(text) is not None
+
+    def _check_idx(self, idx: int, seq, hint: str = '') -> Optional[str]:
+        """检查索引是否越界，越界时返回提示信息"""
+        if 0 <= idx < len(seq):
+            return None
+        return f'索引越界, {hint}' if hint else '索引越界'
 
     @filter.command_group('rss', alias={'RSS'})
     def rss(self):
@@ -842,19 +1154,18 @@ class RssPlugin(Star):
         Args:
             url: RSSHub服务器地址，例如：https://rsshub.app
         """
-        if url.endswith('/'):
-            url = url[:-1]
+        url = url.rstrip('/')
         # 检查是否为url或ip
         if not self._is_url_or_ip(url):
             yield event.plain_result('请输入正确的URL')
             return
         # 检查该网址是否已存在
-        elif url in self.data_handler.data['rsshub_endpoints']:
-            yield event.plain_result('该RSSHub端点已存在')
+        elif self.data_handler.has_endpoint(url):
+            yield event.plain_result(f'该RSSHub端点已存在，索引为 {self.data_handler.get_endpoint_index(url)}')
             return
         else:
-            self.data_handler.data['rsshub_endpoints'].append(url)
-            self.data_handler.save_data()
+            self.data_handler.add_endpoint(url)
+            self.data_handler.mark_dirty()
             yield event.plain_result('添加成功')
 
     @rsshub.command('list')
@@ -862,7 +1173,7 @@ class RssPlugin(Star):
         """列出所有已添加的RSSHub端点"""
         ret = '当前Bot添加的rsshub endpoint：\n'
         yield event.plain_result(
-            ret + '\n'.join([f'{i}: {x}' for i, x in enumerate(self.data_handler.data['rsshub_endpoints'])])
+            ret + '\n'.join(f'{i}: {x}' for i, x in enumerate(self.data_handler.data['rsshub_endpoints']))
         )
 
     @rsshub.command('remove')
@@ -872,14 +1183,13 @@ class RssPlugin(Star):
         Args:
             idx: 要删除的端点索引，可通过list命令查看
         """
-        if idx < 0 or idx >= len(self.data_handler.data['rsshub_endpoints']):
-            yield event.plain_result('索引越界')
+        err = self._check_idx(idx, self.data_handler.data['rsshub_endpoints'])
+        if err:
+            yield event.plain_result(err)
             return
         else:
-            # TODO:删除对应的定时任务
-            self.scheduler.remove_job()
-            self.data_handler.data['rsshub_endpoints'].pop(idx)
-            self.data_handler.save_data()
+            self.data_handler.remove_endpoint(idx)
+            self.data_handler.mark_dirty()
             yield event.plain_result('删除成功')
 
     @rss.command('add')
@@ -905,8 +1215,11 @@ class RssPlugin(Star):
             month: Cron表达式月份字段
             day_of_week: Cron表达式星期字段
         """
-        if idx < 0 or idx >= len(self.data_handler.data['rsshub_endpoints']):
-            yield event.plain_result('索引越界, 请使用 /rss rsshub list 查看已经添加的 rsshub endpoint')
+        err = self._check_idx(
+            idx, self.data_handler.data['rsshub_endpoints'], '请使用 /rss rsshub list 查看已经添加的 rsshub endpoint'
+        )
+        if err:
+            yield event.plain_result(err)
             return
         if not route.startswith('/'):
             yield event.plain_result('路由必须以 / 开头')
@@ -916,18 +1229,17 @@ class RssPlugin(Star):
         cron_expr = f'{minute} {hour} {day} {month} {day_of_week}'
 
         ret = await self._add_url(url, cron_expr, event)
-        if isinstance(ret, MessageEventResult):
-            yield ret
+        if ret.error is not None:
+            yield ret.error
             return
-        else:
-            chan_title = ret['title']
-            chan_desc = ret['description']
+        chan_title = ret.info['title']
+        chan_desc = ret.info['description']
 
-        # 刷新定时任务
-        self._fresh_asyncIOScheduler()
+        user = event.unified_msg_origin
+        # 添加该订阅的定时任务
+        self._schedule_subscription(url, user, cron_expr)
 
         # 获取新添加订阅的索引
-        user = event.unified_msg_origin
         subs_urls = self.data_handler.get_subs_channel_url(user)
         try:
             new_idx = subs_urls.index(url)
@@ -966,18 +1278,17 @@ class RssPlugin(Star):
         """
         cron_expr = f'{minute} {hour} {day} {month} {day_of_week}'
         ret = await self._add_url(url, cron_expr, event)
-        if isinstance(ret, MessageEventResult):
-            yield ret
+        if ret.error is not None:
+            yield ret.error
             return
-        else:
-            chan_title = ret['title']
-            chan_desc = ret['description']
+        chan_title = ret.info['title']
+        chan_desc = ret.info['description']
 
-        # 刷新定时任务
-        self._fresh_asyncIOScheduler()
+        user = event.unified_msg_origin
+        # 添加该订阅的定时任务
+        self._schedule_subscription(url, user, cron_expr)
 
         # 获取新添加订阅的索引
-        user = event.unified_msg_origin
         subs_urls = self.data_handler.get_subs_channel_url(user)
         try:
             new_idx = subs_urls.index(url)
@@ -997,26 +1308,22 @@ class RssPlugin(Star):
     async def list_command(self, event: AstrMessageEvent):
         """列出当前所有订阅的RSS频道"""
         user = event.unified_msg_origin
-        ret = '📋 当前订阅列表：\n'
         subs_urls = self.data_handler.get_subs_channel_url(user)
 
         if not subs_urls:
             yield event.plain_result('当前没有任何订阅。')
             return
 
-        cnt = 0
-        for url in subs_urls:
+        parts = ['📋 当前订阅列表：\n']
+        for cnt, url in enumerate(subs_urls):
             info = self.data_handler.data[url]['info']
             # 获取该用户的 cron 表达式
             sub_info = self.data_handler.data[url]['subscribers'].get(user, {})
             cron = sub_info.get('cron_expr', '未知')
 
-            ret += f'[{cnt}] {info["title"]}\n'
-            ret += f'🔗 {url}\n'
-            ret += f'⏰ Cron: {cron}\n'
-            cnt += 1
+            parts.append(f'[{cnt}] {info["title"]}\n🔗 {url}\n⏰ Cron: {cron}\n')
 
-        yield event.plain_result(ret)
+        yield event.plain_result(''.join(parts))
 
     @rss.command('remove')
     async def remove_command(self, event: AstrMessageEvent, idx: int):
@@ -1026,16 +1333,17 @@ class RssPlugin(Star):
             idx: 要删除的订阅索引，可通过/rss list查看
         """
         subs_urls = self.data_handler.get_subs_channel_url(event.unified_msg_origin)
-        if idx < 0 or idx >= len(subs_urls):
-            yield event.plain_result('索引越界, 请使用 /rss list 查看已经添加的订阅')
+        err = self._check_idx(idx, subs_urls, '请使用 /rss list 查看已经添加的订阅')
+        if err:
+            yield event.plain_result(err)
             return
         url = subs_urls[idx]
-        self.data_handler.data[url]['subscribers'].pop(event.unified_msg_origin)
+        self.data_handler.remove_subscriber(url, event.unified_msg_origin)
 
-        self.data_handler.save_data()
+        self.data_handler.mark_dirty()
 
-        # 刷新定时任务
-        self._fresh_asyncIOScheduler()
+        # 删除该订阅的定时任务
+        self._unschedule_subscription(url, event.unified_msg_origin)
         yield event.plain_result('删除成功')
 
     @rss.command('get')
@@ -1046,8 +1354,9 @@ class RssPlugin(Star):
             idx: 要查看的订阅索引，可通过/rss list查看
         """
         subs_urls = self.data_handler.get_subs_channel_url(event.unified_msg_origin)
-        if idx < 0 or idx >= len(subs_urls):
-            yield event.plain_result('索引越界, 请使用 /rss list 查看已经添加的订阅')
+        err = self._check_idx(idx, subs_urls, '请使用 /rss list 查看已经添加的订阅')
+        if err:
+            yield event.plain_result(err)
             return
         url = subs_urls[idx]
         rss_items = await self.poll_rss(url)
@@ -1055,33 +1364,23 @@ class RssPlugin(Star):
             yield event.plain_result('没有新的订阅内容')
             return
         item = rss_items[0]
-        # 分解MessageSesion
-        platform_name, message_type, session_id = event.unified_msg_origin.split(':')
-
-        # 构造返回消息链
-        main_comps, video_comp = await self._get_chain_components(item)
-
-        # 区分平台构造消息链
-        if self.is_compose:
-            # 1. 文本和图片 Node
-            node = Comp.Node(uin=0, name='Astrbot', content=main_comps)
-            nodes_list = [node]
-
-            # 2. 视频 Node
-            if video_comp:
-                video_node = Comp.Node(uin=0, name='Astrbot', content=[video_comp])
-                nodes_list.append(video_node)
-
-            # 发送合并消息
-            nodes_container = Comp.Nodes(nodes_list)
-            target_message_chain = MessageChain(chain=[nodes_container], use_t2i_=False)
-            await self._safe_send_message(event.unified_msg_origin, target_message_chain)
-        else:
-            # 单条发送模式
-            target_message_chain = MessageChain(chain=main_comps, use_t2i_=self.t2i)
-            await self._safe_send_message(event.unified_msg_origin, target_message_chain)
-
-            # 视频独立发送
-            if video_comp:
-                video_chain = MessageChain(chain=[video_comp], use_t2i_=False)
-                await self._safe_send_message(event.unified_msg_origin, video_chain)
+        # 发送完成前不淘汰已下载的图片/视频
+        with self.pic_handler.hold_cached_files():
+            # 构造返回消息链
+            main_comps, video_comp = await self._get_chain_components(item)
+
+            # 区分平台构造消息链
+            if self.is_compose:
+                # 发送合并消息
+                nodes_container = Comp.Nodes(_build_nodes(main_comps, video_comp))
+                target_message_chain = MessageChain(chain=[nodes_container], use_t2i_=False)
+                await self._safe_send_message(event.unified_msg_origin, target_message_chain)
+            else:
+                # 单条发送模式
+                target_message_chain = MessageChain(chain=main_comps, use_t2i_=self.t2i)
+                await self._safe_send_message(event.unified_msg_origin, target_message_chain)
+
+                # 视频独立发送
+                if video_comp:
+                    video_chain = MessageChain(chain=[video_comp], use_t2i_=False)
+                    await self._safe_send_message(event.unified_msg_origin, video_chain)
@@ -5,55 +5,204 @@ import os
 import random
 import tempfile
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from io import BytesIO
+from typing import Callable, Dict, List, Optional
 from urllib.parse import urlparse
 
 import aiohttp
-from PIL import Image
+from PIL import Image, JpegImagePlugin
+
+# 同时下载图片的最大数量
+_MAX_CONCURRENT_DOWNLOADS = 8
+# 下载超时设置，模块级共享，避免每次请求重新创建；视频文件较大，超时更长
+_IMAGE_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+_VIDEO_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=10)
+# 单张图片的最大字节数与防和谐处理的最大像素数，防止超大图片或解压炸弹耗尽内存
+_MAX_IMAGE_BYTES = 50 * 1024 * 1024
+_MAX_ADJUST_PIXELS = 50_000_000
+# 流式下载时每次读取的数据块大小
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# JPEG 文件头 (SOI) 与注释段 (COM) 标记
+_JPEG_SOI = b'\xff\xd8'
+_JPEG_COM = b'\xff\xfe'
+# 文件头魔数与后缀的对应关系
+_MAGIC_EXTS = ((b'GIF8', '.gif'), (b'\x89PNG', '.png'), (_JPEG_SOI + b'\xff', '.jpg'))
+# Content-Type 与后缀的对应关系
+_CONTENT_TYPE_EXTS = {
+    'image/gif': '.gif',
+    'image/png': '.png',
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/webp': '.webp',
+}
+# 记录后缀与 URL 不一致的图片路径的最大数量
+_MAX_SNIFFED_PATHS = 1024
+# 限制缓存大小时，同时最多保留的文件数量，超出后删除最久未使用的文件
+_MAX_CACHED_FILES = 4096
+
+
+def _sniff_ext(head: bytes, content_type: str) -> Optional[str]:
+    """根据文件头识别图片后缀，无法识别时参考 Content-Type"""
+    for magic, ext in _MAGIC_EXTS:
+        if head.startswith(magic):
+            return ext
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    return _CONTENT_TYPE_EXTS.get(content_type.split(';', 1)[0].strip().lower())
+
+
+def _patch_jpeg_bytes(img_bytes: bytes) -> Optional[bytes]:
+    """在 JPEG 文件头后插入随机注释段，改变文件哈希而无需解码/重新编码；非 JPEG 返回 None"""
+    if not img_bytes.startswith(_JPEG_SOI):
+        return None
+    # 注释段: 标记 + 长度 (含长度字段自身 2 字节) + 4 字节随机内容
+    return _JPEG_SOI + _JPEG_COM + b'\x00\x06' + os.urandom(4) + img_bytes[2:]
+
+
+@lru_cache(maxsize=2048)
+def _file_path(temp_dir: str, url: str) -> str:
+    """计算 URL 对应的缓存文件路径，同一图片在多次轮询中反复出现，结果缓存起来"""
+    hash_name = hashlib.md5(url.encode('utf-8')).hexdigest()
+    # 解析 URL 路径部分来判断后缀，忽略 query 参数 (如 ?tag=21)
+    path_lower = urlparse(url).path.lower()
+
+    if path_lower.endswith('.gif'):
+        ext = '.gif'
+    elif path_lower.endswith('.mp4'):
+        ext = '.mp4'
+    elif path_lower.endswith('.png'):
+        ext = '.png'
+    else:
+        # .jpg/.jpeg 及默认后缀
+        ext = '.jpg'
+
+    return os.path.join(temp_dir, f'{hash_name}{ext}')
 
 
 class RssImageHandler:
     """rss处理图片/视频的类"""
 
-    def __init__(self, is_adjust_pic=False):
+    def __init__(
+        self,
+        is_adjust_pic=False,
+        get_session: Optional[Callable[[], aiohttp.ClientSession]] = None,
+        max_cache_bytes: int = 0,
+    ):
         """
         初始化媒体处理类
 
         Args:
             is_adjust_pic (bool): 是否防和谐，默认为 False。
+            get_session (Callable): 获取共享 HTTP 会话的函数，未提供时使用自己的会话。
+            max_cache_bytes (int): 缓存文件最大占用空间（字节），0 表示不限制。
         """
         self.is_adjust_pic = is_adjust_pic
+        self.get_session = get_session
+        self.http_session = None
         self.logger = logging.getLogger('astrbot')
+        self.download_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_DOWNLOADS)  # 同时下载图片的最大数量
+        self.inflight_downloads: Dict[str, asyncio.Task] = {}  # 格式: {url: 进行中的下载}
+        self.sniffed_paths: Dict[str, str] = {}  # 格式: {url: 按实际内容修正后缀后的路径}
+        self.cached_files: OrderedDict[str, int] = OrderedDict()  # 格式: {已下载的文件路径: 文件大小}，按最近使用排序
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_bytes = 0  # 缓存文件当前占用的总字节数
+        self.eviction_holds = 0  # 正在准备或等待发送的消息数量，大于 0 时暂停淘汰缓存文件
 
         # 临时目录
         self.temp_dir = os.path.join(tempfile.gettempdir(), 'astrbot_rss_cache')
-        if not os.path.exists(self.temp_dir):
+        try:
+            # exist_ok 已处理目录存在的情况，无需先检查
+            os.makedirs(self.temp_dir, exist_ok=True)
+        except Exception as e:
+            self.logger.error(f'[RSS] 创建临时目录失败: {e}')
+        self._load_cached_files()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取 HTTP 会话，所有下载复用同一个连接池"""
+        if self.get_session is not None:
+            return self.get_session()
+        if self.http_session is None or self.http_session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=_MAX_CONCURRENT_DOWNLOADS, ttl_dns_cache=300)
+            self.http_session = aiohttp.ClientSession(trust_env=True, connector=connector)
+        return self.http_session
+
+    async def close(self):
+        """关闭自己创建的 HTTP 会话"""
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+
+    def _is_cached(self, path: str) -> bool:
+        """检查文件是否已下载且不为空，优先查内存记录，省去 stat 调用"""
+        try:
+            self.cached_files.move_to_end(path)
+            return True
+        except KeyError:
+            pass
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        if size <= 0:
+            return False
+        self.cached_files[path] = size
+        self.cache_bytes += size
+        self._evict_cached_files()
+        return True
+
+    def _load_cached_files(self):
+        """启动时扫描一次缓存目录，按修改时间从旧到新登记已有文件"""
+        try:
+            with os.scandir(self.temp_dir) as it:
+                entries = sorted((e.stat().st_mtime, e.path, e.stat().st_size) for e in it if e.is_file())
+        except OSError:
+            return
+        for _, path, size in entries:
+            if size > 0:
+                self.cached_files[path] = size
+                self.cache_bytes += size
+        self._evict_cached_files()
+
+    def _evict_cached_files(self):
+        """超出文件数量或总大小上限时，从最久未使用的文件开始删除 (至少保留最近使用的一个)"""
+        # 未限制大小时不淘汰；有消息尚未发送时推迟到全部发送后再淘汰，避免删除待发送的文件
+        if self.max_cache_bytes <= 0 or self.eviction_holds:
+            return
+        cached_files = self.cached_files
+        while len(cached_files) > 1 and (
+            len(cached_files) > _MAX_CACHED_FILES or self.cache_bytes > self.max_cache_bytes
+        ):
+            path, size = cached_files.popitem(last=False)
+            self.cache_bytes -= size
             try:
-                os.makedirs(self.temp_dir, exist_ok=True)
-            except Exception as e:
-                self.logger.error(f'[RSS] 创建临时目录失败: {e}')
+                os.remove(path)
+            except OSError:
+                pass
+
+    def acquire_cached_files(self):
+        """暂停淘汰缓存文件，已下载但尚未发送的文件不会被删除；需与 release_cached_files 成对调用"""
+        self.eviction_holds += 1
+
+    def release_cached_files(self):
+        """释放一次暂停，全部释放后补做淘汰"""
+        self.eviction_holds -= 1
+        self._evict_cached_files()
+
+    @contextmanager
+    def hold_cached_files(self):
+        """在准备和发送消息期间暂停淘汰缓存文件"""
+        self.acquire_cached_files()
+        try:
+            yield
+        finally:
+            self.release_cached_files()
 
     def _get_file_path(self, url: str) -> str:
         """根据URL生成唯一的文件路径 (MD5)，保留后缀"""
         try:
-            hash_name = hashlib.md5(url.encode('utf-8')).hexdigest()
-            # 解析 URL 路径部分来判断后缀，忽略 query 参数 (如 ?tag=21)
-            parsed = urlparse(url)
-            path_lower = parsed.path.lower()
-
-            if path_lower.endswith('.gif'):
-                ext = '.gif'
-            elif path_lower.endswith('.mp4'):
-                ext = '.mp4'
-            elif path_lower.endswith('.png'):
-                ext = '.png'
-            elif path_lower.endswith('.jpg') or path_lower.endswith('.jpeg'):
-                ext = '.jpg'
-            else:
-                # 默认后缀
-                ext = '.jpg'
-
-            return os.path.join(self.temp_dir, f'{hash_name}{ext}')
+            return _file_path(self.temp_dir, url)
         except Exception:
             return os.path.join(self.temp_dir, f'temp_{int(time.time())}.jpg')
 
@@ -61,6 +210,7 @@ class RssImageHandler:
         """
         下载图片并保存为本地文件 (包含重试机制)。
         如果文件已存在且有效，则直接返回路径。
+        同一图片正在下载时，直接等待该下载完成，不会重复下载。
 
         Args:
             image_url (str): 图片链接
@@ -69,19 +219,32 @@ class RssImageHandler:
         Returns:
             str: 本地文件的绝对路径。如果失败返回 None。
         """
-        save_path = self._get_file_path(image_url)
+        task = self.inflight_downloads.get(image_url)
+        if task is None:
+            task = asyncio.ensure_future(self._download_image(image_url, max_retries))
+            self.inflight_downloads[image_url] = task
+            task.add_done_callback(lambda _: self.inflight_downloads.pop(image_url, None))
+        # shield: 某个等待方被取消时不影响其他等待方
+        return await asyncio.shield(task)
+
+    async def _download_image(self, image_url: str, max_retries: int) -> str:
+        """下载图片的实际逻辑"""
+        guessed_path = self._get_file_path(image_url)
+        save_path = self.sniffed_paths.get(image_url, guessed_path)
 
         # 1. 检查缓存：如果文件存在且不为空，直接返回
-        if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
+        if self._is_cached(save_path):
             return save_path
 
+        # 需要防和谐处理时才把整张图片读入内存 (GIF 不处理)
+        need_adjust = self.is_adjust_pic and not guessed_path.endswith('.gif')
+
         # 2. 下载并处理
         for attempt in range(max_retries):
             try:
-                # 设置超时，防止单次请求卡死
-                timeout = aiohttp.ClientTimeout(total=30)
-                async with aiohttp.ClientSession(trust_env=True, timeout=timeout) as session:
-                    async with session.get(image_url) as resp:
+                # 限制同时下载的图片数量，避免并发下载时压垮图片服务器
+                async with self.download_semaphore:
+                    async with self._get_session().get(image_url, timeout=_IMAGE_TIMEOUT) as resp:
                         if resp.status != 200:
                             self.logger.warning(
                                 f'[RSS] 第 {attempt + 1}/{max_retries} 次获取图片失败: 状态码 {resp.status} - {image_url}'
@@ -89,52 +252,65 @@ class RssImageHandler:
                             # 如果不是200，跳过本次循环，进入下一次重试
                             continue
 
-                        # 读取图片数据到内存
-                        img_bytes = await resp.read()
-
-                        # 判断是否为 GIF (通过URL或文件名)
-                        is_gif = save_path.endswith('.gif')
-
-                        # 3. 防和谐处理逻辑 (如果是GIF则跳过)
-                        if self.is_adjust_pic and not is_gif:
-                            try:
-                                img_data = BytesIO(img_bytes)
-                                img = Image.open(img_data)
-                                img = img.convert('RGB')
-
-                                width, height = img.size
-                                pixels = img.load()
-                                corners = [(0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)]
-                                # 随机选择一个角落修改像素
-                                chosen_corner = random.choice(corners)
-                                # 修改为接近白色的颜色 (254, 254, 254)
-                                pixels[chosen_corner[0], chosen_corner[1]] = (254, 254, 254)
-
-                                # 保存修改后的图片到文件
-                                img.save(save_path, format='JPEG', quality=90)
-                            except Exception as e:
-                                self.logger.error(f'[RSS] 图片防和谐处理失败: {e}，尝试保存原图')
-                                with open(save_path, 'wb') as f:
-                                    f.write(img_bytes)
+                        # 声明的大小超出上限时直接放弃，不必下载
+                        if (resp.content_length or 0) > _MAX_IMAGE_BYTES:
+                            self.logger.warning(f'[RSS] 图片过大 ({resp.content_length} 字节)，跳过: {image_url}')
+                            return None
+
+                        chunks = resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE)
+                        head = await anext(chunks, b'')
+
+                        # URL 后缀不可靠 (如 ?format=gif 或无后缀)，按实际内容修正后缀，避免 GIF 被当作 JPEG 处理
+                        content_type = resp.headers.get('Content-Type', '')
+                        save_path = self._resolve_path(image_url, guessed_path, _sniff_ext(head[:12], content_type))
+
+                        # 未声明大小时边下载边计数，超出上限立即中止
+                        size = len(head)
+                        if need_adjust:
+                            # 读取图片数据到内存
+                            parts = [head]
+                            async for chunk in chunks:
+                                size += len(chunk)
+                                if size > _MAX_IMAGE_BYTES:
+                                    break
+                                parts.append(chunk)
+                            img_bytes = b''.join(parts)
                         else:
-                            # 4. 不需要处理(或GIF)，直接保存原图
+                            # 无需处理时直接流式写入文件，不在内存中保留完整图片
                             with open(save_path, 'wb') as f:
-                                f.write(img_bytes)
+                                f.write(head)
+                                async for chunk in chunks:
+                                    size += len(chunk)
+                                    if size > _MAX_IMAGE_BYTES:
+                                        break
+                                    f.write(chunk)
+
+                        if size > _MAX_IMAGE_BYTES:
+                            self.logger.warning(f'[RSS] 图片超过 {_MAX_IMAGE_BYTES} 字节，已中止下载: {image_url}')
+                            try:
+                                os.remove(save_path)
+                            except OSError:
+                                pass
+                            return None
+
+                if need_adjust:
+                    # 3. 处理并保存图片，PIL 与磁盘写入都是阻塞操作，放到线程中执行，避免卡住事件循环
+                    await asyncio.to_thread(self._save_image, img_bytes, save_path)
 
-                        # 再次确认文件是否写入成功
-                        if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
-                            return save_path
+                # 再次确认文件是否写入成功
+                if self._is_cached(save_path):
+                    return save_path
 
-            except asyncio.TimeoutError:
-                self.logger.warning(f'[RSS] 第 {attempt + 1}/{max_retries} 次下载超时: {image_url}')
             except Exception as e:
-                self.logger.warning(f'[RSS] 第 {attempt + 1}/{max_retries} 次下载/保存异常: {e} - {image_url}')
-                # 清理可能的损坏文件
-                if os.path.exists(save_path):
-                    try:
-                        os.remove(save_path)
-                    except:
-                        pass
+                if isinstance(e, asyncio.TimeoutError):
+                    self.logger.warning(f'[RSS] 第 {attempt + 1}/{max_retries} 次下载超时: {image_url}')
+                else:
+                    self.logger.warning(f'[RSS] 第 {attempt + 1}/{max_retries} 次下载/保存异常: {e} - {image_url}')
+                # 清理可能的损坏文件 (流式写入中途超时也会留下不完整的文件)
+                try:
+                    os.remove(save_path)
+                except OSError:
+                    pass
 
             # 如果不是最后一次尝试，等待一小段时间再重试 (1秒, 2秒...)
             if attempt < max_retries - 1:
@@ -144,6 +320,56 @@ class RssImageHandler:
         self.logger.error(f'[RSS] 图片最终下载失败，已重试 {max_retries} 次: {image_url}')
         return None
 
+    def _resolve_path(self, image_url: str, guessed_path: str, ext: Optional[str]) -> str:
+        """按识别出的后缀修正保存路径，并记录与 URL 推断不一致的路径"""
+        if ext is None or guessed_path.endswith(ext):
+            return guessed_path
+        path = os.path.splitext(guessed_path)[0] + ext
+        self.sniffed_paths[image_url] = path
+        if len(self.sniffed_paths) > _MAX_SNIFFED_PATHS:
+            # 淘汰最早记录的路径
+            del self.sniffed_paths[next(iter(self.sniffed_paths))]
+        return path
+
+    def _save_image(self, img_bytes: bytes, save_path: str):
+        """保存图片，开启防和谐时先处理图片 (同步执行，需在线程中调用)"""
+        # 判断是否为 GIF (通过URL或文件名)
+        is_gif = save_path.endswith('.gif')
+
+        # 防和谐处理逻辑 (如果是GIF则跳过)
+        if self.is_adjust_pic and not is_gif:
+            # JPEG 直接改写字节，省去整图解码和重新编码
+            patched = _patch_jpeg_bytes(img_bytes)
+            if patched is not None:
+                with open(save_path, 'wb') as f:
+                    f.write(patched)
+                return
+            try:
+                img = Image.open(BytesIO(img_bytes))
+                # Image.open 只读取文件头，像素过多时不解码，直接保存原图
+                if img.width * img.height > _MAX_ADJUST_PIXELS:
+                    raise ValueError(f'图片尺寸过大 ({img.width}x{img.height})')
+                # 已是 RGB 时无需 convert，避免整图复制
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+
+                width, height = img.size
+                corners = [(0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)]
+                # 随机选择一个角落修改像素
+                chosen_corner = random.choice(corners)
+                # 修改为接近白色的颜色 (254, 254, 254)，单个像素用 putpixel 即可，无需构建 PixelAccess
+                img.putpixel(chosen_corner, (254, 254, 254))
+
+                # 保存修改后的图片到文件
+                img.save(save_path, format='JPEG', quality=90)
+                return
+            except Exception as e:
+                self.logger.error(f'[RSS] 图片防和谐处理失败: {e}，尝试保存原图')
+
+        # 不需要处理(或GIF/处理失败)，直接保存原图
+        with open(save_path, 'wb') as f:
+            f.write(img_bytes)
+
     async def get_video_file(self, video_url: str, max_retries: int = 3) -> str:
         """
         下载视频并保存为本地文件。
@@ -155,35 +381,31 @@ class RssImageHandler:
             save_path = os.path.splitext(save_path)[0] + '.mp4'
 
         # 1. 检查缓存
-        if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
+        if self._is_cached(save_path):
             return save_path
 
         # 2. 下载
         for attempt in range(max_retries):
             try:
-                # 视频文件较大，设置更长的超时
-                timeout = aiohttp.ClientTimeout(total=120, connect=10)
-                async with aiohttp.ClientSession(trust_env=True, timeout=timeout) as session:
-                    async with session.get(video_url) as resp:
-                        if resp.status != 200:
-                            self.logger.warning(f'[RSS] 视频下载失败: {resp.status} - {video_url}')
-                            continue
+                async with self._get_session().get(video_url, timeout=_VIDEO_TIMEOUT) as resp:
+                    if resp.status != 200:
+                        self.logger.warning(f'[RSS] 视频下载失败: {resp.status} - {video_url}')
+                        continue
 
-                        # 流式写入，避免内存占用过大
-                        with open(save_path, 'wb') as f:
-                            async for chunk in resp.content.iter_chunked(1024):
-                                f.write(chunk)
+                    # 流式写入，避免内存占用过大
+                    with open(save_path, 'wb') as f:
+                        async for chunk in resp.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
 
-                        if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
-                            return save_path
+                    if self._is_cached(save_path):
+                        return save_path
 
             except Exception as e:
                 self.logger.warning(f'[RSS] 视频下载异常: {e} - {video_url}')
-                if os.path.exists(save_path):
-                    try:
-                        os.remove(save_path)
-                    except:
-                        pass
+                try:
+                    os.remove(save_path)
+                except OSError:
+                    pass
 
             if attempt < max_retries - 1:
                 await asyncio.sleep(2 + attempt)
@@ -191,11 +413,25 @@ class RssImageHandler:
         self.logger.error(f'[RSS] 视频最终下载失败: {video_url}')
         return None
 
-    def rotate_image_180(self, file_path: str) -> bool:
+    async def rotate_image_180(self, file_path: str) -> bool:
         """
         读取指定路径的图片，旋转180度并覆盖保存
         用于在发送失败（风控）时尝试绕过
         """
+        # 图片解码/编码较耗时，放到线程中执行，避免阻塞事件循环
+        rotated = await asyncio.to_thread(self._rotate_image_180, file_path)
+        if rotated and file_path in self.cached_files:
+            # 重新编码后文件大小会变化，同步更新缓存占用
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+            self.cache_bytes += size - self.cached_files[file_path]
+            self.cached_files[file_path] = size
+        return rotated
+
+    def _rotate_image_180(self, file_path: str) -> bool:
+        """旋转图片的实际逻辑 (同步执行，需在线程中调用)"""
         try:
             if not os.path.exists(file_path):
                 return False
@@ -204,11 +440,17 @@ class RssImageHandler:
                 return False
 
             # 打开图片
-            img = Image.open(file_path)
-            # 旋转 180 度
-            img = img.transpose(Image.ROTATE_180)
-            # 覆盖保存
-            img.save(file_path, quality=85)
+            with Image.open(file_path) as src:
+                # 旋转 180 度
+                img = src.transpose(Image.Transpose.ROTATE_180)
+                img_format = src.format
+                if img_format == 'JPEG':
+                    # 沿用原图的量化表与采样方式，避免多次重试后画质逐渐下降
+                    save_kwargs = {'qtables': src.quantization, 'subsampling': JpegImagePlugin.get_sampling(src)}
+                else:
+                    save_kwargs = {}
+            # 按原格式覆盖保存，避免 PNG 等被转换为 JPEG
+            img.save(file_path, format=img_format, **save_kwargs)
 
             self.logger.warning(f'[RSS] 以此尝试绕过风控: 已将图片旋转180度 -> {os.path.basename(file_path)}')
             return True
@@ -216,31 +458,39 @@ class RssImageHandler:
             self.logger.error(f'[RSS] 旋转图片失败: {e}')
             return False
 
-    def cleanup_temp_files(self, max_age_seconds=3600):
+    async def cleanup_temp_files(self, max_age_seconds=3600):
         """
         清理过期的临时文件
         Args:
             max_age_seconds: 文件保留的最长时间（秒）
         """
+        # 扫描与删除在线程中执行，缓存记录只在事件循环中更新，避免与下载流程竞争
+        removed = await asyncio.to_thread(self._remove_expired_files, max_age_seconds)
+        for path in removed:
+            self.cache_bytes -= self.cached_files.pop(path, 0)
+        if removed:
+            self.logger.info(f'[RSS] 已清理 {len(removed)} 个过期临时文件 (阈值: {max_age_seconds}s)')
+
+    def _remove_expired_files(self, max_age_seconds) -> List[str]:
+        """删除过期的临时文件，返回已删除的文件路径 (同步执行，需在线程中调用)"""
         current_time = time.time()
-        count = 0
+        removed = []
         try:
-            if not os.path.exists(self.temp_dir):
-                return
-
-            files = os.listdir(self.temp_dir)
-            for filename in files:
-                file_path = os.path.join(self.temp_dir, filename)
-                if os.path.isfile(file_path):
+            # scandir 直接返回文件类型信息，比 listdir + isfile + getmtime 少一次 stat
+            with os.scandir(self.temp_dir) as it:
+                for entry in it:
                     try:
-                        file_mtime = os.path.getmtime(file_path)
-                        if current_time - file_mtime > max_age_seconds:
-                            os.remove(file_path)
-                            count += 1
+                        if (
+                            entry.is_file(follow_symlinks=False)
+                            and current_time - entry.stat().st_mtime > max_age_seconds
+                        ):
+                            os.remove(entry.path)
+                            removed.append(entry.path)
                     except Exception:
                         continue
-
-            if count > 0:
-                self.logger.info(f'[RSS] 已清理 {count} 个过期临时文件 (阈值: {max_age_seconds}s)')
+        except FileNotFoundError:
+            # 临时目录不存在，无需清理
+            pass
         except Exception as e:
             self.logger.error(f'[RSS] 清理临时文件失败: {e}')
+        return removed
@@ -1,8 +1,8 @@
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import dataclass
+from typing import Tuple
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RSSItem:
     chan_title: str
     title: str
@@ -10,11 +10,11 @@ class RSSItem:
     description: str
     pubDate: str
     pubDate_timestamp: int
-    pic_urls: List[str]
+    pic_urls: Tuple[str, ...]
 
     # 扩展字段
     author: str = ''
-    categories: List[str] = field(default_factory=list)
+    categories: Tuple[str, ...] = ()
     content: str = ''  # 完整内容(content:encoded)
     summary: str = ''  # 摘要
     enclosure_url: str = ''  # 附件URL(音频/视频等)